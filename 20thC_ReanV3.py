@@ -7,7 +7,11 @@ import pandas as pd
 import xarray as xr
 import matplotlib.pyplot as plt
 
-from mpl_toolkits.basemap import Basemap
+from incremental import load_state, new_steps, update, year_month_table
+from output import metadata_columns, reduced_chunks, write_table
+from profiling import stage
+from reanalysis import open_reanalysis
+from render import BATCH, region_map_figure, render_figures, show_figures
 
 #########################################
 
@@ -27,6 +31,10 @@ def std_lon(da, lon_name):
 
     return da
 
+
+def spatial_mean(ds):
+    return ds.mean(dim=['lon', 'lat'], keep_attrs=True)
+
 #########################################
 
 # Different of other folders where SI
@@ -53,25 +61,18 @@ reigeorge_lon = (-59, -58)
 
 #########################################
 
-nc = xr.open_mfdataset(
-    path,
-    concat_dim='time',
-    combine='by_coords'
-)
-
-nc = nc.drop_dims('nbnds')
+with stage('open'):
+    nc = open_reanalysis(path)
 
-nc = std_lon(nc, 'lon')
+    nc = nc.drop_dims('nbnds')
 
+    nc = std_lon(nc, 'lon')
 
-column_names = {}
+    # Columns retain long_name and units info
+    column_names = metadata_columns(nc, coords=('lat', 'lon', 'time', 'time_bnds'))
 
-for var in nc.variables.keys():
-    try:
-        ['lat', 'lon', 'time', 'time_bnds'].index(var)
-    
-    except:
-        column_names[var] = nc[var].long_name.replace(' ', '_') + '-(' + nc[var].units.replace(' ', '.') + ')'
+# (function, args, filename) of each map, see render.py
+MAPS = []
 
 
 nc1 = nc.sel(
@@ -83,64 +84,39 @@ nc1 = nc.sel(
         shetland_lat[1])
 )
 
-fig, ax = plt.subplots()
-
-# Creating specific variables to customize the map
-parallels = nc1.lat.values
-meridians = nc1.lon.values
-
-# Defining map settings
-m = Basemap (projection='merc',
-             llcrnrlat=-64.02, urcrnrlat=-60.98, 
-             llcrnrlon=-63.01, urcrnrlon=-56.98, 
-             resolution='f', area_thresh=0, ax=ax)
-            # resolution -> 'c'=crude, 'l'=low, 'i'=intermediate, 'h'=high and 'f'=full
-
-m.drawcoastlines(linewidth=0.5)
-m.drawmapboundary()
-
-m.fillcontinents(color='gray', zorder=1)
-
-
-m.drawparallels(parallels, labels=[True, True, False, False], color='k',
-                linewidth=0.5, fontweight='bold', fontsize=10, zorder=999)
-m.drawmeridians(meridians, labels=[False, False, True, True], color='k',
-                linewidth=0.5, fontweight='bold', fontsize=10, zorder=999, rotation=45)
-
-
-lon, lat = np.meshgrid(nc1.lon.values, nc1.lat.values)
-
-# Setting coordinate variables for this especific map
-x, y = m(lon, lat)
-
-plt.pcolor(x, y, nc1.tco3[0])
-plt.scatter(x, y, c=nc1.tco3[0], zorder=99)
-
-plt.colorbar()
-
-# Spatial mean
-nc1 = nc1.mean(dim=['lon', 'lat'], keep_attrs=True)
-
-# Transforming the xr.Dataset into a pd.DataFrame
-df1 = nc1.to_dataframe()
-
-# Renaming columns to retain long_name and units info
-df1.rename(index=str, columns=column_names, inplace=True)
-
-df1.index = pd.to_datetime(df1.index, yearfirst=True)
+# Map of the first time step, drawn with the other ones
+# at the end of the script
+MAPS.append((
+    region_map_figure,
+    (nc1.lon.values,
+     nc1.lat.values,
+     nc1.tco3[0].values,
+     (-64.02, -60.98, -63.01, -56.98)),
+    os.path.join(
+        '/home/douglasnehme/Desktop/bia/arquivos/',
+        '20thC_ReanV3_shetland')))
 
-df1 = df1.groupby([df1.index.year, df1.index.month]).mean()
+# Only the months after the last run are averaged, the
+# older ones are already in the stored aggregates
+with stage('shetland_mean'):
+    nc1 = new_steps(nc1, '20thC_ReanV3_shetland')
 
-df1.index.names = ['', ''] 
+    # Spatial mean, reduced one chunk of time at a time with
+    # columns that retain long_name and units info, and added
+    # to the stored aggregates
+    for part in reduced_chunks(nc1, spatial_mean, column_names):
+        update('20thC_ReanV3_shetland', part)
 
-df1 = df1.unstack()
+    df1 = year_month_table(load_state('20thC_ReanV3_shetland')['aggregates'])
 
 # Saving
-df1.to_csv(
-    os.path.join(
-        '/home/douglasnehme/Desktop/bia/arquivos/',
-        '20thC_ReanV3_shetland.csv'
-))
+with stage('shetland_write'):
+    write_table(
+        df1,
+        os.path.join(
+            '/home/douglasnehme/Desktop/bia/arquivos/',
+            '20thC_ReanV3_shetland.csv'
+    ))
 
 
 
@@ -155,63 +131,43 @@ nc2 = nc.sel(
 )
 
 
-fig, ax = plt.subplots()
-
-# Creating specific variables to customize the map
-parallels = nc2.lat.values
-meridians = nc2.lon.values
-
-# Defining map settings
-m = Basemap (projection='merc',
-             llcrnrlat=-63.02, urcrnrlat=-60.98, 
-             llcrnrlon=-60.01, urcrnrlon=-56.98, 
-             resolution='f', area_thresh=0, ax=ax)
-            # resolution -> 'c'=crude, 'l'=low, 'i'=intermediate, 'h'=high and 'f'=full
-
-m.drawcoastlines(linewidth=0.5)
-m.drawmapboundary()
-
-m.fillcontinents(color='gray')
-
-
-m.drawparallels(parallels, labels=[True, True, False, False], color='k',
-                linewidth=0.5, fontweight='bold', fontsize=10, zorder=999)
-m.drawmeridians(meridians, labels=[False, False, True, True], color='k',
-                linewidth=0.5, fontweight='bold', fontsize=10, zorder=999, rotation=45)
-
-
-lon, lat = np.meshgrid(nc2.lon.values, nc2.lat.values)
-
-# Setting coordinate variables for this especific map
-x, y = m(lon, lat)
-
-plt.pcolor(x, y, nc2.tco3[0])
-plt.scatter(x, y, c=nc2.tco3[0], zorder=99)
-
-plt.colorbar()
-
-plt.show()
-
-# Spatial mean
-nc2 = nc2.mean(dim=['lon', 'lat'], keep_attrs=True)
-
-# Transforming the xr.Dataset into a pd.DataFrame
-df2 = nc2.to_dataframe()
-
-# Renaming columns to retain long_name and units info
-df2.rename(index=str, columns=column_names, inplace=True)
-
-df2.index = pd.to_datetime(df2.index, yearfirst=True)
+# Map of the first time step, drawn with the other ones
+# at the end of the script
+MAPS.append((
+    region_map_figure,
+    (nc2.lon.values,
+     nc2.lat.values,
+     nc2.tco3[0].values,
+     (-63.02, -60.98, -60.01, -56.98)),
+    os.path.join(
+        '/home/douglasnehme/Desktop/bia/arquivos/',
+        '20thC_ReanV3_reigeorge')))
 
-df2 = df2.groupby([df2.index.year, df2.index.month]).mean()
+# Only the months after the last run are averaged, the
+# older ones are already in the stored aggregates
+with stage('reigeorge_mean'):
+    nc2 = new_steps(nc2, '20thC_ReanV3_reigeorge')
 
-df2.index.names = ['', ''] 
+    # Spatial mean, reduced one chunk of time at a time with
+    # columns that retain long_name and units info, and added
+    # to the stored aggregates
+    for part in reduced_chunks(nc2, spatial_mean, column_names):
+        update('20thC_ReanV3_reigeorge', part)
 
-df2 = df2.unstack()
+    df2 = year_month_table(load_state('20thC_ReanV3_reigeorge')['aggregates'])
 
 # Saving
-df2.to_csv(
-    os.path.join(
-        '/home/douglasnehme/Desktop/bia/arquivos/',
-        '20thC_ReanV3_reigeorge.csv'
-))
+with stage('reigeorge_write'):
+    write_table(
+        df2,
+        os.path.join(
+            '/home/douglasnehme/Desktop/bia/arquivos/',
+            '20thC_ReanV3_reigeorge.csv'
+    ))
+
+# ANNABIA_BATCH=1 saves all maps concurrently without display
+with stage('maps'):
+    if BATCH:
+        render_figures(MAPS)
+    else:
+        show_figures(MAPS)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Monthly and annual means of sub-daily series
+#            with the number of observations and coverage of
+#            each period, masking incomplete ones
+
+import numpy as np
+import pandas as pd
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# Layers of the result of aggregate()
+LAYERS = ['value', 'count', 'coverage']
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def sampling_step(index):
+    """
+    Returns the nominal time step of a series, its most
+    common interval between observations
+    """
+    steps = pd.Series(np.diff(pd.DatetimeIndex(index).values))
+
+    if steps.empty:
+        raise ValueError('At least two time steps are needed to infer the sampling step')
+
+    return pd.Timedelta(steps.mode().iloc[0])
+
+
+def aggregate(df, freq='MS', step=None, min_coverage=0.75):
+    """
+    Means of a sub-daily series per period together with the
+    number of observations and the coverage of each period,
+    computed in the same groupby pass.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DatetimeIndex, one column per variable, NaN where
+        missing. Missing time steps may be absent or NaN
+    freq : str
+        'MS' for months or 'YS' for years
+    step : str or pd.Timedelta
+        Nominal sampling step, e.g. '6h' for INUMET synoptic
+        data, default is the most common interval of df
+    min_coverage : float
+        Fraction (0 to 1) of the expected observations below
+        which the period mean is NaN
+
+    Returns
+    -------
+    pd.DataFrame with period starts on index and (layer,
+    variable) columns, where layer is 'value' (mean),
+    'count' (valid observations) or 'coverage' (count over
+    the observations expected in the period)
+    """
+    step = sampling_step(df.index) if step is None else pd.Timedelta(step)
+
+    grouped = df.resample(freq)
+
+    total = grouped.sum(min_count=1)
+    count = grouped.count()
+
+    # Observations expected in each period, from its length
+    start = count.index
+    end = start + pd.tseries.frequencies.to_offset(freq)
+    expected = np.asarray((end - start) / step, dtype=float)
+
+    coverage = count.div(expected, axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        value = (total / count).where(coverage >= min_coverage)
+
+    return pd.concat([value, count, coverage], axis=1, keys=LAYERS)
+
+
+def year_month_table(result, layer='value'):
+    """
+    Years on rows and (variable, month) on columns of one
+    layer of a monthly aggregate() result, as the scripts
+    save them
+    """
+    df = result[layer]
+
+    df = df.groupby([df.index.year, df.index.month]).mean()
+    df.index.names = ['', '']
+
+    return df.unstack()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Comparing write time and file size of each
+#            output format of output.py
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from output import EXTENSIONS, write_table
+
+##############################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ##################################
+##############################################################################
+# Hours of the synthetic box series, default is
+# 30 years of hourly ERA5 data
+NROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 30 * 365 * 24
+
+COLUMNS = [
+    '10_metre_U_wind_component-(m.s**-1)',
+    '10_metre_V_wind_component-(m.s**-1)',
+    'Mean_sea_level_pressure-(Pa)',
+    '2_metre_temperature-(K)',
+    'Total_column_ozone-(kg.m**-2)',
+]
+##############################################################################
+# BENCHMARKING ###############################################################
+##############################################################################
+rng = np.random.default_rng(0)
+
+df = pd.DataFrame(
+    rng.standard_normal((NROWS, len(COLUMNS))),
+    index=pd.date_range('1990-01-01', periods=NROWS, freq='h'),
+    columns=COLUMNS)
+
+print('{} rows x {} columns'.format(*df.shape))
+print('{:>8} {:>10} {:>10}'.format('format', 'time (s)', 'size (MB)'))
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    for fmt in EXTENSIONS:
+        start = time.perf_counter()
+        path = write_table(df, os.path.join(tmpdir, 'benchmark'), fmt=fmt)
+        stop = time.perf_counter()
+
+        print('{:>8} {:>10.2f} {:>10.2f}'.format(
+            fmt,
+            stop - start,
+            os.path.getsize(path) / 1e6))
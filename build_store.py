@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Loading all stations' sources into the columnar
+#            store of store.py
+
+import os
+
+from datetime import datetime
+
+import store
+
+from dtypes import compact, memory_report
+from profiling import stage
+from reader import load_reader_archive
+from stations import METADICT
+
+start = datetime.now().replace(microsecond = 0)
+##############################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ##################################
+##############################################################################
+ROOTDIR = u'/home/douglasnehme/Desktop/bia'
+DATADIR = os.path.join(ROOTDIR, 'arquivos')
+##############################################################################
+# LOADING EACH SOURCE ########################################################
+##############################################################################
+# Memory of each source as loaded and after the dtype policy
+MEMORY = {}
+
+
+def load(name, df):
+    compacted = compact(df)
+
+    MEMORY[name] = (df, compacted)
+
+    store.write(compacted)
+
+
+# READER monthly tables of all stations
+with stage('reader'):
+    load('reader', store.from_reader(load_reader_archive()))
+
+# Stations' workbooks used by estacoes.py
+for key in METADICT.keys():
+    with stage(key):
+        load(key, store.from_station_xlsx(key, ROOTDIR))
+
+# INUMET sub-daily data used by vento_temp_artigas.py
+with stage('artigas'):
+    load('artigas', store.from_inumet(
+        os.path.join(DATADIR, u'Datos INUMET Antártida 1998-2016_vento e temp.xlsx'),
+        station='artigas'))
+
+# Bellingshausen workbooks used by vento_bellingshausen.py
+with stage('bellingshausen_inumet'):
+    load('bellingshausen_inumet', store.from_year_month_tables(
+        {'wdir': os.path.join(DATADIR, u'vento_bellingshausen_direcao.xlsx'),
+         'wspd': os.path.join(DATADIR, u'vento_bellingshausen_velocidade.xlsx')},
+        station='bellingshausen_inumet'))
+
+print(memory_report(MEMORY))
+
+stop = datetime.now().replace(microsecond=0)
+
+print('Time taken to execute program: {}'.format(stop - start))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: On disk cache of objects that are slow to
+#            compute and depend only on a few parameters
+
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+CACHEDIR = os.environ.get(
+    'ANNABIA_CACHEDIR',
+    os.path.expanduser('~/.cache/annabia'))
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def cache_key(*args, **kwargs):
+    """
+    Returns a sha1 hex digest of the arguments. Dicts are
+    sorted, so the order that keywords are given doesn't
+    change the key
+    """
+    text = json.dumps(
+        [args, kwargs],
+        sort_keys=True,
+        default=repr)
+
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def cache_path(namespace, key, ext='.pkl', cachedir=None):
+    """
+    Returns the file of a key inside cachedir/namespace
+    """
+    if cachedir is None:
+        cachedir = CACHEDIR
+
+    return os.path.join(cachedir, namespace, key + ext)
+
+
+def load(path):
+    """
+    Returns the object pickled in path or None if it
+    doesn't exist or can't be read, including pickles left
+    by older versions of the modules of its classes (pandas,
+    numpy, basemap), so the callers compute it again
+    """
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (IOError, OSError, EOFError, pickle.UnpicklingError,
+            AttributeError, ImportError, TypeError, ValueError, IndexError):
+        return None
+
+
+def store(path, obj):
+    """
+    Pickles obj into path. The file is written under a
+    temporary name and then renamed, so a broken run never
+    leaves half a file in the cache
+    """
+    folder = os.path.dirname(path)
+
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    fd, tmp = tempfile.mkstemp(dir=folder)
+
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.replace(tmp, path)
+
+    return path
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Compact dtypes for the loaded data (float32
+#            values, uint8 flags and categorical
+#            identifiers) and their memory use
+
+import numpy as np
+import pandas as pd
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# Stations measure with 1 decimal at most, so float32 (7
+# significant digits) keeps every value
+VALUE_DTYPE = np.float32
+
+# Flags with codes up to 7 fit in uint8, see flags.py
+SMALL_FLAG_DTYPE = np.uint8
+
+# Identifier columns stored as categoricals
+CATEGORIES = ['station', 'variable', 'source']
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def compact_flags(flags):
+    """
+    Returns a flag bitmask as SMALL_FLAG_DTYPE when all its
+    codes fit in it, otherwise unchanged
+    """
+    flags = np.asarray(flags)
+
+    if flags.size == 0 or flags.max() <= np.iinfo(SMALL_FLAG_DTYPE).max:
+        return flags.astype(SMALL_FLAG_DTYPE)
+
+    return flags
+
+
+def compact(df):
+    """
+    Applies the dtype policy to a DataFrame: float columns
+    to VALUE_DTYPE, integer flag columns to SMALL_FLAG_DTYPE
+    when possible, identifier and other text columns to
+    categoricals and small integers to their smallest type
+    """
+    df = df.copy()
+
+    for col in df.columns:
+        series = df[col]
+
+        if pd.api.types.is_float_dtype(series):
+            df[col] = series.astype(VALUE_DTYPE)
+        elif col == 'flag':
+            df[col] = compact_flags(series.values)
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif col in CATEGORIES or pd.api.types.is_string_dtype(series):
+            df[col] = series.astype('category')
+
+    return df
+
+
+def memory_usage(obj):
+    """
+    Bytes used by a DataFrame, Series, numpy array or xarray
+    object, including the strings of object columns
+    """
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True, index=True))
+
+    return int(obj.nbytes)
+
+
+def memory_report(datasets):
+    """
+    Memory of each dataset before and after the policy.
+
+    Parameters
+    ----------
+    datasets : dict
+        Name and (before, after) objects
+
+    Returns
+    -------
+    pd.DataFrame with MB before, after and their ratio, plus
+    a 'total' row
+    """
+    report = pd.DataFrame(
+        [(memory_usage(before), memory_usage(after)) for before, after in datasets.values()],
+        index=list(datasets.keys()),
+        columns=['before', 'after'],
+        dtype=float)
+
+    report.loc['total'] = report.sum()
+
+    report = report / 2.**20
+    report['ratio'] = report['after'] / report['before']
+
+    return report
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Empirical orthogonal functions (EOF) of one or
+#            more reanalysis fields, with area weighting and
+#            the covariance accumulated chunk by chunk along
+#            time, so memory depends on the grid and the chunk
+#            size but not on the length of the record
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from profiling import stage
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# Time steps read at a time, one year of hourly fields
+CHUNK = 8760
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def _chunks(ds, time, chunk):
+    """
+    Yields (start, part) of ds along time
+    """
+    for start in range(0, ds.sizes[time], chunk):
+        yield start, ds.isel({time: slice(start, start + chunk)})
+
+
+def _matrix(part, variables, time, lat, lon):
+    """
+    (time, point) float64 array of the variables of a chunk,
+    the points of each variable one after the other in (lat,
+    lon) order, whatever the order of the dimensions in the
+    file
+    """
+    return np.concatenate([
+        part[var].transpose(time, lat, lon).values.reshape(part.sizes[time], -1)
+        for var in variables], axis=1).astype(np.float64)
+
+
+def _groups(part, time, climatology):
+    """
+    Calendar month (0 to 11) of each time step of a chunk,
+    or 0 for all of them when there's no climatology
+    """
+    if climatology:
+        return pd.DatetimeIndex(part[time].values).month.values - 1
+
+    return np.zeros(part.sizes[time], dtype=int)
+
+
+def eof(ds, variables, n_modes=3, lat='latitude', lon='longitude', time='time',
+        climatology=True, chunk=CHUNK):
+    """
+    EOFs of anomalies of fields on a lat x lon grid, in 3
+    passes over the data, each reading one chunk of time at
+    a time:
+
+        1. means (per calendar month when climatology) and
+           standard deviations of each grid point
+        2. area weighted covariance matrix of the anomalies
+        3. principal components, projecting the anomalies on
+           the EOFs
+
+    so only the (point, point) covariance and one chunk are
+    in memory. With more than one variable, e.g. u10, v10 and
+    msl, they are analysed together after dividing each one
+    by its domain mean standard deviation.
+
+        modes = eof(box(xr.open_dataset(NCFILE), lat, lon), ['u10', 'v10', 'msl'])
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Lazy (opened, not loaded) Dataset, or its box
+    variables : list
+        Fields with (time, lat, lon) dimensions
+    n_modes : int
+        Modes returned. Modes beyond the rank of the
+        covariance (eigenvalue of zero, e.g. more modes than
+        time steps) are dropped with a warning
+    lat, lon, time : str
+        Dimension names
+    climatology : bool
+        Removes the mean annual cycle (monthly means) instead
+        of the time mean only
+    chunk : int
+        Time steps per chunk
+
+    Returns
+    -------
+    xr.Dataset with, for each variable, its EOF patterns
+    (mode, lat, lon) in the units of the variable, as the
+    anomaly of one standard deviation of the principal
+    component, and 'pc' (time, mode) standardised principal
+    components, 'variance_fraction' and 'eigenvalue' (mode).
+    Grid points with missing values are NaN in the patterns
+    and left out of the analysis
+    """
+    variables = list(variables)
+
+    shape = (ds.sizes[lat], ds.sizes[lon])
+    size = shape[0] * shape[1]
+    ngroup = 12 if climatology else 1
+
+    # sqrt(cos(lat)) weights, so each point's variance
+    # counts by the area of its cell
+    weight = np.sqrt(np.clip(np.cos(np.radians(ds[lat].values)), 0., None))
+    weight = np.tile(np.repeat(weight, shape[1]), len(variables))
+
+    with stage('eof/means'):
+        total = np.zeros((ngroup, size * len(variables)))
+        square = np.zeros(size * len(variables))
+        count = np.zeros((ngroup, size * len(variables)))
+
+        for start, part in _chunks(ds, time, chunk):
+            X = _matrix(part, variables, time, lat, lon)
+            groups = _groups(part, time, climatology)
+
+            valid = ~np.isnan(X)
+            X = np.where(valid, X, 0.)
+
+            for g in np.unique(groups):
+                total[g] += X[groups == g].sum(axis=0)
+                count[g] += valid[groups == g].sum(axis=0)
+
+            square += (X ** 2).sum(axis=0)
+
+        ntime = ds.sizes[time]
+
+        # Points missing at any time step are left out
+        keep = count.sum(axis=0) == ntime
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / count
+
+        # Anomaly variance of each point from the raw
+        # moments, only used to scale the variables
+        variance = square - (total ** 2 / np.where(count > 0, count, 1.)).sum(axis=0)
+        variance = np.where(keep, variance, np.nan) / (ntime - 1)
+
+        scale = np.concatenate([
+            np.repeat(np.sqrt(np.nanmean(variance[i * size:(i + 1) * size])), size)
+            for i in range(len(variables))]) if len(variables) > 1 else np.ones(size)
+
+    factor = weight[keep] / scale[keep]
+
+    with stage('eof/covariance'):
+        covariance = np.zeros((keep.sum(), keep.sum()))
+
+        for start, part in _chunks(ds, time, chunk):
+            A = (_matrix(part, variables, time, lat, lon) - mean[_groups(part, time, climatology)])[:, keep] * factor
+
+            covariance += A.T.dot(A)
+
+        covariance /= ntime - 1
+
+    with stage('eof/eigh'):
+        eigenvalue, vectors = np.linalg.eigh(covariance)
+
+        # Largest first
+        eigenvalue = eigenvalue[::-1]
+        vectors = vectors[:, ::-1][:, :n_modes]
+
+        variance_fraction = eigenvalue[:n_modes] / eigenvalue.sum()
+        eigenvalue = eigenvalue[:n_modes]
+
+        # Eigenvalues at the round off level of the largest
+        # one have no variance to standardise their PCs
+        rank = eigenvalue > eigenvalue[0] * len(covariance) * np.finfo(float).eps
+
+        if not rank.all():
+            warnings.warn('Only {} of the {} modes asked have variance, the others are dropped'.format(
+                rank.sum(), n_modes))
+
+            eigenvalue = eigenvalue[rank]
+            vectors = vectors[:, rank]
+            variance_fraction = variance_fraction[rank]
+
+    with stage('eof/pcs'):
+        pc = np.empty((ntime, len(eigenvalue)))
+
+        for start, part in _chunks(ds, time, chunk):
+            A = (_matrix(part, variables, time, lat, lon) - mean[_groups(part, time, climatology)])[:, keep] * factor
+
+            pc[start:start + part.sizes[time]] = A.dot(vectors)
+
+        pc /= np.sqrt(eigenvalue)
+
+    # Patterns back in the units of each variable
+    patterns = np.full((len(eigenvalue), size * len(variables)), np.nan)
+    patterns[:, keep] = (vectors * np.sqrt(eigenvalue)).T / factor
+
+    result = xr.Dataset(coords={
+        'mode': np.arange(1, len(eigenvalue) + 1),
+        lat: ds[lat].values,
+        lon: ds[lon].values,
+        time: ds[time].values})
+
+    for i, var in enumerate(variables):
+        result[var] = (('mode', lat, lon),
+                       patterns[:, i * size:(i + 1) * size].reshape((-1,) + shape),
+                       ds[var].attrs)
+
+    result['pc'] = ((time, 'mode'), pc)
+    result['variance_fraction'] = ('mode', variance_fraction)
+    result['eigenvalue'] = ('mode', eigenvalue)
+
+    return result
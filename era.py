@@ -16,6 +16,12 @@ import numpy as np
 import pandas as pd
 import xarray as xr
 
+from dtypes import compact, memory_report
+from output import write_table
+from profiling import stage
+from reanalysis import open_reanalysis
+from seasons import SEASONS, seasonal
+
 ##################################################################################################################################
 #### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
 ##################################################################################################################################
@@ -76,7 +82,7 @@ def pol2cart_wind(wspd, wdir, axes_rotation = 0, magnetic_declination = 0):
     import math
 
     # Step 1
-    wdir = math.ceil(wdir) # always rounds the float number to next integer, but returns a float number
+    wdir = np.ceil(wdir) # always rounds the float number to next integer, but returns a float number
     wspd = round(wspd, 1)  # round a number to a given precision in decimal digits considering round laws
 
     # Step 2
@@ -165,7 +171,7 @@ def cart2pol_wind(u, v, axes_rotation = 0, magnetic_declination = 0):
         wdir = wdir + 360.
 
     # Step 5
-    wdir = math.ceil(wdir) # always rounds the float number to next integer, but returns a float number
+    wdir = np.ceil(wdir) # always rounds the float number to next integer, but returns a float number
     wspd = round(wspd, 1) # round a number to a given precision in decimal digits considering round laws
 
     return(wspd, wdir)
@@ -176,20 +182,39 @@ def cart2pol_wind(u, v, axes_rotation = 0, magnetic_declination = 0):
 #### IMPORTING AND MANIPULATING ALL TIME SERIES ##################################################################################
 ##################################################################################################################################
 
-era = xr.open_dataset(os.path.join(DATADIR, 'era.nc'))
+with stage('open'):
+    era = open_reanalysis(os.path.join(DATADIR, 'era.nc'))
+
+    era = era.assign_coords(longitude = era.longitude - 360.)
+
+    u = era.u10[ :, 5, 29].values
+    v = era.v10[ :, 5, 29].values
+
+with stage('wind'):
+    wspd, wdir = [np.nan] * len(era.time), [np.nan] * len(era.time)
+
+    for i in range(len(era.time)):
+        wspd[i], wdir[i] = cart2pol_wind(u[i], v[i])
+
+    df = pd.DataFrame (index = era.time.data, columns = ['u', 'v', 'spd'],
+                       data = {'u': u, 'v': v, 'spd': wspd} )
 
-era.longitude.data = era.longitude.data - 360.
+    # float32 columns, see dtypes.py
+    df, df_loaded = compact(df), df
 
-wspd, wdir = [np.nan] * len(era.time), [np.nan] * len(era.time)
+    print(memory_report({'era': (df_loaded, df)}))
 
-for i in xrange(len(era.time)):
-    wspd[i], wdir[i] = cart2pol_wind(era.u10[ :, 5, 29].data[i], era.v10[ :, 5, 29].data[i])
+# Austral seasons, with DJF spanning two calendar years
+with stage('seasons'):
+    df_season = seasonal(df.resample('MS').mean()).unstack().reindex(columns = SEASONS, level = 'season')
 
-df = pd.DataFrame (index = era.time.data, columns = ['u', 'v', 'spd'],
-                   data = {'u': era.u10[ :, 5, 29].data, 'v': era.v10[ :, 5, 29].data, 'spd': wspd} )
+with stage('write_seasons'):
+    write_table(df_season, os.path.join(ROOTDIR, 'reanalise', 'era_interim2_estacoes.xlsx'))
 
-df = df.resample('A').mean()
+with stage('annual'):
+    df = df.resample('YE').mean()
 
-df = df.to_period('A')
+    df = df.to_period('Y')
 
-df.to_excel(os.path.join(ROOTDIR, 'reanalise', 'era_interim2.xlsx'))
\ No newline at end of file
+with stage('write_annual'):
+    write_table(df, os.path.join(ROOTDIR, 'reanalise', 'era_interim2.xlsx'))
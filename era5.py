@@ -22,9 +22,12 @@ import matplotlib.patheffects as PathEffects # Handle text effects, in this case
 from netCDF4 import Dataset
 from datetime import datetime
 from matplotlib.patches import Polygon
-from mpl_toolkits.basemap import Basemap
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 
+from output import OUTPUT_FORMAT, export_reduced, metadata_columns, output_format, output_path
+from pipeline import run, step
+from render import BATCH, current_style, quicklook_figure, region_map_figure, render_figures, show_figures
+
 
 start = datetime.now().replace(microsecond = 0)
 ##################################################################################################################################
@@ -46,188 +49,141 @@ mpl.rcParams['savefig.format'] = 'jpeg'
 # m_lon = (-51.0, -30.0)
 
 ##################################################################################################################################
-#### IMPORTING AND MANIPULATING ALL TIME SERIES ##################################################################################
+#### FUNCTIONS ###################################################################################################################
 ##################################################################################################################################
-
-# Openning the netCDF archive
-nc = xr.open_dataset(os.path.join(ROOTDIR, 'era5.nc'))
-
-column_names = {}
-
-for var in nc.variables.keys():
-    try:
-        # nc.coords.keys().index(var)
-        ['latitude', 'longitude', 'time'].index(var)
-    
-    except:
-
-        column_names[var] = nc[var].long_name.replace(' ', '_') + '-(' + nc[var].units.replace(' ', '.') + ')'
-
+# Steps of the pipeline at the end of the script, see pipeline.py
+
+def box(nc, lat, lon):
+    """
+    Selects a lat x lon box of the ERA5 grid, which has
+    latitudes in descending order
+    """
+    return nc.sel(
+        longitude=slice(
+            lon[0],
+            lon[1]), 
+        latitude=slice(
+            lat[1],
+            lat[0])
+    )
+
+
+def box_mean(nc, lat, lon):
+    """
+    Spatial mean of a box, keeping the attributes
+    """
+    return box(nc, lat, lon).mean(dim=['longitude', 'latitude'], keep_attrs=True)
+
+
+def export_box(nc, column_names, path, lat, lon, fmt=None):
+    """
+    Saves the spatial mean of a box with columns named by
+    long_name and units, reducing and writing it one chunk
+    of time at a time, in fmt (see output.output_format)
+    """
+    return export_reduced(
+        nc,
+        path,
+        reduce=lambda part: box_mean(part, lat, lon),
+        columns=column_names,
+        fmt=fmt)
+
+
+def map_job(nc, filename, lat=None, lon=None):
+    """
+    (function, args, filename) of the map of the first time
+    step of the whole file, as a quick-look, or of a box
+    """
+    if lat is None:
+        return (
+            quicklook_figure,
+            (nc.longitude.values,
+             nc.latitude.values,
+             nc.tco3[0].values,
+             'ERA5 tco3'),
+            filename)
+
+    nc = box(nc, lat, lon)
+
+    return (
+        region_map_figure,
+        (nc.longitude.values,
+         nc.latitude.values,
+         nc.tco3[0].values,
+         (lat[0] - 0.001, lat[1] + 0.001,
+          lon[0] - 0.001, lon[1] + 0.001)),
+        filename)
+
+
+def collect(*items):
+    return list(items)
 
 ##################################################################################################################################
-#### PLOTTING DATA ###############################################################################################################
+#### IMPORTING, MANIPULATING AND PLOTTING DATA ###################################################################################
 ##################################################################################################################################
-
-fig, ax = plt.subplots()
+# Only steps whose code, parameters or inputs changed run
+# again, e.g. changing render.py only redraws the maps
 
 shetland_lat = (-63.5, -61.8)
 shetland_lon = (-63.1, -57.4)
 
-nc1 = nc.sel(
-    longitude=slice(
-        shetland_lon[0],
-        shetland_lon[1]), 
-    latitude=slice(
-        shetland_lat[1],
-        shetland_lat[0])
-)
-
-# Creating specific variables to customize the map
-# parallels = np.arange(shetland_lat[0], shetland_lat[1] + 0.5, 0.5)
-# meridians = np.arange(shetland_lon[0], shetland_lon[1] + 1, 1)
-parallels = nc1.latitude.values
-meridians = nc1.longitude.values
-
-# Defining map settings
-m = Basemap (projection='merc',
-             llcrnrlat=shetland_lat[0] - 0.001, urcrnrlat=shetland_lat[1] + 0.001, 
-             llcrnrlon=shetland_lon[0] - 0.001, urcrnrlon=shetland_lon[1] + 0.001, 
-             resolution='f', area_thresh=0, ax=ax)
-            # resolution -> 'c'=crude, 'l'=low, 'i'=intermediate, 'h'=high and 'f'=full
-
-# m.drawstates(linewidth=0.5)
-m.drawcoastlines(linewidth=0.5)
-m.drawmapboundary()
-
-m.fillcontinents(color='gray')
-
-
-m.drawparallels(parallels, labels=[True, True, False, False], color='k',
-                linewidth=0.5, fontweight='bold', fontsize=10, zorder=999)
-m.drawmeridians(meridians, labels=[False, False, True, True], color='k',
-                linewidth=0.5, fontweight='bold', fontsize=10, zorder=999, rotation=45)
-
-# m.drawmapscale(-48.7, -16, -40, -22, 400, barstyle = 'fancy', zorder = 3)
-# # os dois primeiros argumentos se referem a posição da escala no mapa
-# # os dois seguintes se referem a latitude e longitude central para cálculo da escala no mapa
-# # o quarto argumento se refere ao tamanho, em Km, da escala
-# # o quinto argumento se refere ao estilo.
-
-# # Plotting zonal section in 22°S
-# m.plot([-40.46, -39., -39], [-22., -22., -22.], '-',
-#        color='r', linewidth=4, latlon=True, zorder=3)
-
-# Because our lon and lat variables are 1D, use meshgrid to create 2D arrays
-# Not necessary if coordinates are already in 2D arrays.
-
-lon, lat = np.meshgrid(nc1.longitude.values, nc1.latitude.values)
-
-# Setting coordinate variables for this especific map
-x, y = m(lon, lat)
-
-plt.pcolor(x, y, nc1.tco3[0])
-plt.scatter(x, y, c=nc1.tco3[0])
-
-plt.colorbar()
-
-# Spatial mean
-nc1 = nc1.mean(dim=['longitude', 'latitude'], keep_attrs=True)
-
-# Transforming the xr.Dataset into a pd.DataFrame
-df1 = nc1.to_dataframe()
-
-# Renaming columns to retain long_name and units info
-df1.rename(index=str, columns=column_names, inplace=True)
-
-# Saving
-df1.to_csv(os.path.join(ROOTDIR, 'era5_shetland.csv'))
-
-
-
-
-
-fig, ax = plt.subplots()
-
 reigeorge_lat = (-62.5, -61.8)
 reigeorge_lon = (-59.3, -57.4)
 
-nc2 = nc.sel(
-    longitude=slice(
-        reigeorge_lon[0],
-        reigeorge_lon[1]), 
-    latitude=slice(
-        reigeorge_lat[1],
-        reigeorge_lat[0])
-)
-
-
-# Creating specific variables to customize the map
-# parallels = np.arange(reigeorge_lat[0], reigeorge_lat[1] + 0.5, 0.5)
-# meridians = np.arange(reigeorge_lon[0], reigeorge_lon[1] + 1, 1)
-parallels = nc2.latitude.values
-meridians = nc2.longitude.values
-
-# Defining map settings
-m = Basemap (projection='merc',
-             llcrnrlat=reigeorge_lat[0] - 0.001, urcrnrlat=reigeorge_lat[1] + 0.001, 
-             llcrnrlon=reigeorge_lon[0] - 0.001, urcrnrlon=reigeorge_lon[1] + 0.001, 
-             resolution='f', area_thresh=0, ax=ax)
-            # resolution -> 'c'=crude, 'l'=low, 'i'=intermediate, 'h'=high and 'f'=full
-
-# m.drawstates(linewidth=0.5)
-m.drawcoastlines(linewidth=0.5)
-m.drawmapboundary()
-
-m.fillcontinents(color='gray')
-
-
-m.drawparallels(parallels, labels=[True, True, False, False], color='k',
-                linewidth=0.5, fontweight='bold', fontsize=10, zorder=999)
-m.drawmeridians(meridians, labels=[False, False, True, True], color='k',
-                linewidth=0.5, fontweight='bold', fontsize=10, zorder=999, rotation=45)
-
-# m.drawmapscale(-48.7, -16, -40, -22, 400, barstyle = 'fancy', zorder = 3)
-# # os dois primeiros argumentos se referem a posição da escala no mapa
-# # os dois seguintes se referem a latitude e longitude central para cálculo da escala no mapa
-# # o quarto argumento se refere ao tamanho, em Km, da escala
-# # o quinto argumento se refere ao estilo.
-
-# # Plotting zonal section in 22°S
-# m.plot([-40.46, -39., -39], [-22., -22., -22.], '-',
-#        color='r', linewidth=4, latlon=True, zorder=3)
-
-# Because our lon and lat variables are 1D, use meshgrid to create 2D arrays
-# Not necessary if coordinates are already in 2D arrays.
-
-# lon, lat = np.meshgrid(nc.longitude.values, nc.latitude.values)
-lon, lat = np.meshgrid(nc2.longitude.values, nc2.latitude.values)
-
-# Setting coordinate variables for this especific map
-x, y = m(lon, lat)
-
-
-plt.pcolor(x, y, nc2.tco3[0])
-plt.scatter(x, y, c=nc2.tco3[0])
-
-plt.colorbar()
-
-# Spatial mean
-nc2 = nc2.mean(dim=['longitude', 'latitude'], keep_attrs=True)
-
-# Keep only datetime part that is varing
-nc1['time'] = nc1.indexes['time'].normalize()
-
-# Transforming the xr.Dataset into a pd.DataFrame
-df2 = nc2.to_dataframe()
-
-# Renaming columns to retain long_name and units info
-df2.rename(index=str, columns=column_names, inplace=True)
-
-# Saving
-df2.to_csv(os.path.join(ROOTDIR, 'era5_reigeorge.csv'))
-
-
-plt.show()
+NCFILE = os.path.join(ROOTDIR, 'era5.nc')
+
+# Tables in ANNABIA_OUTPUT_FORMAT, default is csv. The format
+# is a parameter of the steps, so changing it saves them again
+SHETLAND_FILE = os.path.join(ROOTDIR, 'era5_shetland.csv')
+REIGEORGE_FILE = os.path.join(ROOTDIR, 'era5_reigeorge.csv')
+
+STEPS = [
+    # Openning the netCDF archive
+    step('load', xr.open_dataset, files=[NCFILE], cache=False, filename_or_obj=NCFILE),
+
+    # Columns retain long_name and units info
+    step('columns', metadata_columns, inputs=['load'], coords=('latitude', 'longitude', 'time')),
+
+    # Saving
+    step('shetland_csv', export_box, inputs=['load', 'columns'],
+         outputs=[output_path(SHETLAND_FILE, output_format(SHETLAND_FILE))],
+         depends=[box, box_mean],
+         path=SHETLAND_FILE, lat=shetland_lat, lon=shetland_lon, fmt=OUTPUT_FORMAT),
+    step('reigeorge_csv', export_box, inputs=['load', 'columns'],
+         outputs=[output_path(REIGEORGE_FILE, output_format(REIGEORGE_FILE))],
+         depends=[box, box_mean],
+         path=REIGEORGE_FILE, lat=reigeorge_lat, lon=reigeorge_lon, fmt=OUTPUT_FORMAT),
+
+    # Quick-look of the whole file domain over the Antarctic
+    # Peninsula and maps of the first time step of each box
+    step('quicklook_job', map_job, inputs=['load'],
+         filename=os.path.join(ROOTDIR, 'era5_quicklook')),
+    step('shetland_job', map_job, inputs=['load'],
+         filename=os.path.join(ROOTDIR, 'era5_shetland'), lat=shetland_lat, lon=shetland_lon),
+    step('reigeorge_job', map_job, inputs=['load'],
+         filename=os.path.join(ROOTDIR, 'era5_reigeorge'), lat=reigeorge_lat, lon=reigeorge_lon),
+
+    # (function, args, filename) of each map, see render.py
+    step('maps', collect, inputs=['quicklook_job', 'shetland_job', 'reigeorge_job']),
+]
+
+# ANNABIA_BATCH=1 saves all maps concurrently without display,
+# as a step that is cached like the other ones. The mapping
+# functions the figures call are part of its key too
+if BATCH:
+    from mapping import cached_basemap, draw_field
+
+    STEPS.append(step(
+        'render', render_figures, inputs=['maps'],
+        outputs=[os.path.join(ROOTDIR, name + '.' + mpl.rcParams['savefig.format'])
+                 for name in ['era5_quicklook', 'era5_shetland', 'era5_reigeorge']],
+        depends=[quicklook_figure, region_map_figure, cached_basemap, draw_field],
+        style=current_style()))
+
+RESULTS = run(STEPS)
+
+if not BATCH:
+    show_figures(RESULTS['maps'])
 
 
 # # pad keyword controls colorbar's horizontal position. Default is 0.05 if vertical, 0.15 if horizontal
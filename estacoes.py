@@ -17,6 +17,14 @@ import pandas as pd
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 
+from dtypes import VALUE_DTYPE, compact_flags
+from flags import parse_flagged
+from output import write_table
+from profiling import stage
+from render import render_figures, station_annual_figure, station_monthly_figure
+from significance import trend_significance
+from stations import METADICT
+
 ##################################################################################################################################
 #### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
 ##################################################################################################################################
@@ -24,25 +32,6 @@ import matplotlib.pyplot as plt
 
 ROOTDIR = '/home/douglasnehme/Desktop/bia'
 
-
-METADICT = {
-'arturo_prat'    : { 'file': 'arturo_prat',    'name': 'Arturo Prat',    'id': '89057', 'lat': '62.5S', 'lon': '59.7W', 'alt': 5   },
-'bellingshausen' : { 'file': 'bellingshausen', 'name': 'Bellingshausen', 'id': '89050', 'lat': '62.2S', 'lon': '58.9W', 'alt': 16  },
-'deception'      : { 'file': 'deception',      'name': 'Deception',      'id': '88938', 'lat': '63.0S', 'lon': '60.7W', 'alt': 8   },
-'esperanza'      : { 'file': 'esperanza',      'name': 'Esperanza',      'id': '88963', 'lat': '63.4S', 'lon': '57.0W', 'alt': 13  },
-'faraday'        : { 'file': 'faraday',        'name': 'Faraday',        'id': '89063', 'lat': '65.4S', 'lon': '64.4W', 'alt': 11  },
-'ferraz'         : { 'file': 'ferraz',         'name': 'Ferraz',         'id': '89252', 'lat': '62.1S', 'lon': '58.4W', 'alt': 20  },
-'great_wall'     : { 'file': 'great_wall',     'name': 'Great Wall',     'id': '89058', 'lat': '62.2S', 'lon': '59.0W', 'alt': 10  },
-'jubany'         : { 'file': 'jubany',         'name': 'Jubany',         'id': '89053', 'lat': '62.2S', 'lon': '58.6W', 'alt': 4   },
-'king_sejong'    : { 'file': 'king_sejong',    'name': 'King Sejong',    'id': '89251', 'lat': '62.2S', 'lon': '58.7W', 'alt': 11  },
-'marambio'       : { 'file': 'marambio',       'name': 'Marambio',       'id': '89055', 'lat': '64.2S', 'lon': '56.7W', 'alt': 198 },
-'marsh'          : { 'file': 'marsh',          'name': 'Marsh',          'id': '89056', 'lat': '62.2S', 'lon': '58.9W', 'alt': 10  },
-'o_higgins'      : { 'file': 'o_higgins',      'name': "O'Higgins",      'id': '89059', 'lat': '63.3S', 'lon': '57.9W', 'alt': 10  },
-'orcadas'        : { 'file': 'orcadas',        'name': 'Orcadas',        'id': '88968', 'lat': '60.7S', 'lon': '44.7W', 'alt': 6   },
-'palmer'         : { 'file': 'palmer',         'name': 'Palmer',         'id': '89061', 'lat': '64.3S', 'lon': '64.0W', 'alt': 8   },
-'signy'          : { 'file': 'signy',          'name': 'Signy',          'id': '89042', 'lat': '60.7S', 'lon': '45.6W', 'alt': 6   },
-}
-
 mpl.rcParams['axes.labelsize'] = 10
 
 mpl.rcParams['xtick.labelsize'] = 10
@@ -107,7 +96,7 @@ def pol2cart_wind(wspd, wdir, axes_rotation = 0, magnetic_declination = 0):
     import math
 
     # Step 1
-    wdir = math.ceil(wdir) # always rounds the float number to next integer, but returns a float number
+    wdir = np.ceil(wdir) # always rounds the float number to next integer, but returns a float number (NaN stays NaN)
     wspd = round(wspd, 1)  # round a number to a given precision in decimal digits considering round laws
 
     # Step 2
@@ -196,7 +185,7 @@ def cart2pol_wind(u, v, axes_rotation = 0, magnetic_declination = 0):
         wdir = wdir + 360.
 
     # Step 5
-    wdir = math.ceil(wdir) # always rounds the float number to next integer, but returns a float number
+    wdir = np.ceil(wdir) # always rounds the float number to next integer, but returns a float number (NaN stays NaN)
     wspd = round(wspd, 1) # round a number to a given precision in decimal digits considering round laws
 
     return(wspd, wdir)
@@ -237,7 +226,7 @@ def tendency_line_plot(xaxis_variable, yaxis_variable):
     tendency_line = []
     slope, intercept, rvalue, pvalue, stderr = stats.linregress(xaxis_variable, yaxis_variable)
 
-    for i in xrange(len(xaxis_variable)):
+    for i in range(len(xaxis_variable)):
         tendency_line.append(intercept + (slope * xaxis_variable[i]))
 
     plot = plt.plot(tendency_line, yaxis_variable, color = 'red', linewidth = 0.4)
@@ -250,122 +239,93 @@ def tendency_line_plot(xaxis_variable, yaxis_variable):
 ##################################################################################################################################
 c = 1
 
-for key in METADICT.iterkeys():
+# (function, args, filename) of each figure, see render.py
+FIGURES = []
+
+# Yearly zonal wind of each station, for the trends
+U_YEAR = {}
+
+for key in METADICT.keys():
 # for key in ['king_sejong']:
-    print key
+    print(key)
     c = c + 1
 
 
     #### Opening all data ####
 
 
-    wspd, wdir = [], []
-    
-    spd = pd.read_excel(os.path.join(ROOTDIR, METADICT[key]['file'] + '.xlsx'), sheetname = 'Sheet1', na_values = ['-'],
-                        index_col = 'Year')
-
-    spd_flag = spd.copy()
-
-
-    dire = pd.read_excel(os.path.join(ROOTDIR, METADICT[key]['file'] + '.xlsx'), sheetname = 'Sheet2', na_values = ['-'],
-                        index_col = 'Year')
-
-    dire_flag = dire.copy()
-
-    # These loops equalize the initial year of speed and direction DataFrames
-    if spd.index.min() > dire.index.min():                                                     
-
-        spd_begin = spd.reindex(index = np.arange(dire.index.min(), spd.index.min()))
+    with stage('read_excel'):
+        spd = pd.read_excel(os.path.join(ROOTDIR, METADICT[key]['file'] + '.xlsx'), sheet_name = 'Sheet1', na_values = ['-'],
+                            index_col = 'Year')
 
-        spd = pd.concat([spd_begin, spd])
+        dire = pd.read_excel(os.path.join(ROOTDIR, METADICT[key]['file'] + '.xlsx'), sheet_name = 'Sheet2', na_values = ['-'],
+                            index_col = 'Year')
 
-    elif dire.index.min() > spd.index.min():
+        # These loops equalize the initial year of speed and direction DataFrames
+        if spd.index.min() > dire.index.min():                                                     
 
-        dire_begin = dire.reindex(index = np.arange(spd.index.min(), dire.index.min()))
+            spd_begin = spd.reindex(index = np.arange(dire.index.min(), spd.index.min()))
 
-        dire = pd.concat([dire_begin, dire])
+            spd = pd.concat([spd_begin, spd])
 
+        elif dire.index.min() > spd.index.min():
 
-    #### Loops for creating the lists from DataFrames ####
+            dire_begin = dire.reindex(index = np.arange(spd.index.min(), dire.index.min()))
 
+            dire = pd.concat([dire_begin, dire])
 
-    for i in xrange(len(spd.index)):
 
-        for ii in xrange(len(spd.columns)):
+    #### Splitting values and flags ('5.2(3)' cells) ####
 
-            a = spd.ix[spd.index[i], spd.columns[ii]]
-            
-            if type(a) != float:
 
-                b = a.replace(')','').split('(')
+    with stage('parse_flags'):
+        spd, spd_flag = parse_flagged(spd)
+        dire, dire_flag = parse_flagged(dire)
 
-                spd.ix[spd.index[i], spd.columns[ii]] = b[0]
-                spd_flag.ix[spd.index[i], spd.columns[ii]] = b[1]
+        # float32 values and uint8 flags, see dtypes.py
+        spd, spd_flag = spd.astype(VALUE_DTYPE), compact_flags(spd_flag)
+        dire, dire_flag = dire.astype(VALUE_DTYPE), compact_flags(dire_flag)
 
-                wspd.append(float(b[0]))
+        wspd = list(spd.values.ravel())
 
-            if type(a) == float:
-
-                wspd.append(a)
-        
-
-    for i in xrange(len(dire.index)):
-
-        for ii in xrange(len(dire.columns)):
-
-            a = dire.ix[dire.index[i], dire.columns[ii]]
-            
-            if type(a) != float:
-
-                b = a.replace(')','').split('(')
-
-                dire.ix[dire.index[i], dire.columns[ii]] = b[0]
-                dire_flag.ix[dire.index[i], dire.columns[ii]] = b[1]
-
-                # Function 'math.ceil' rounds the float number to next integer, that is different of function 'int', that rounds
-                # for the before integer. In this case 'math.ceil' was choosen to avoid having 0 degree in wind direction and 
-                # making possible having 360 degree.
-                wdir.append(math.ceil(float(b[0])))
-
-            if type(a) == float:
-
-                wdir.append(a)
+        # Function 'np.ceil' rounds the float number to next integer, that is different of function 'int', that rounds
+        # for the before integer. In this case 'np.ceil' was choosen to avoid having 0 degree in wind direction and 
+        # making possible having 360 degree.
+        wdir = list(np.ceil(dire.values.ravel()))
 
 
     #### Loop for creating the wind components (u and v) DataFrames ####
 
 
-    spd = spd.astype(float)
-    spd_flag = spd_flag.astype(float)
-
-    dire = dire.astype(float)
-    dire_flag = dire_flag.astype(float)
-
-    u = spd.copy()
-    v = spd.copy()
+    with stage('wind_components'):
+        u = spd.copy()
+        v = spd.copy()
 
-    for i in xrange(len(spd.index)):
+        for i in range(len(spd.index)):
 
-        for ii in xrange(len(spd.columns)):
+            for ii in range(len(spd.columns)):
 
-            u.iloc[i, ii], v.iloc[i, ii] = pol2cart_wind(spd.iloc[i, ii], dire.iloc[i, ii])
+                u.iloc[i, ii], v.iloc[i, ii] = pol2cart_wind(spd.iloc[i, ii], dire.iloc[i, ii])
 
-    # The slice from 0 to -5 is done to cut final years and transform 2012, testimony collection year, in the last.
-    u = u[0:-5]
-    v = v[0:-5]
+        # The slice from 0 to -5 is done to cut final years and transform 2012, testimony collection year, in the last.
+        u = u[0:-5]
+        v = v[0:-5]
 
 
     #### Data that will be analysed by python plots ####
 
 
-    spd_month = spd.mean(axis = 0)
-    spd_year  = spd.mean(axis = 1)
+    with stage('means'):
+        spd_month = spd.mean(axis = 0)
+        spd_year  = spd.mean(axis = 1)
 
-    u_month   = u.mean(axis = 0)
-    u_year    = u.mean(axis = 1)
+        u_month   = u.mean(axis = 0)
+        u_year    = u.mean(axis = 1)
 
-    v_month   = v.mean(axis = 0)
-    v_year    = v.mean(axis = 1)
+        v_month   = v.mean(axis = 0)
+        v_year    = v.mean(axis = 1)
+
+        U_YEAR[key] = u_year
     
     # These data can't be used, because mean of directions is a wrong method to obtain this estatistical value of a vector
     # dire_month = dire.mean(axis = 0)
@@ -392,58 +352,44 @@ for key in METADICT.iterkeys():
 
     # wind.to_excel (os.path.join(ROOTDIR, METADICT[key]['file'] + '_wrplot' + '.xlsx'), na_rep = 'NaN')
 
-    stop
     ##################################################################################################################################
     #### PLOTTING DATA ###############################################################################################################
     ##################################################################################################################################
 
     #### Plotting Data - Separated Yearly and Monthly Plots ####
-    # fig, ax = plt.subplots(figsize = (5, 7))
-
-    # This plot wasn't do normally (u_year.plot()), because we want to put the years (Serie's index) in the y-axis and the u data
-    # (Serie's values) in x-axis.
-    # plt.plot(u_year.values, u_year.index, color = 'k')
-
-    # ax.set_title(u'{0} ({1} {2})'.format(METADICT[key]['name'], METADICT[key]['lat'], METADICT[key]['lon']), y = 1.07, fontweight = 'bold')
+    # Figures are only listed here and drawn all together, in parallel, after the loop
 
-    # ax.set_xlabel('Componente Zonal do Vento ($\mathregular{m.s^{-1}}$)')
-    # ax.set_ylabel('Anos')
+    title = u'{0} ({1} {2})'.format(METADICT[key]['name'], METADICT[key]['lat'], METADICT[key]['lon'])
 
-    # ax.xaxis.set_label_position('top') # Putting the x-axis label in top border
-    # ax.xaxis.set_ticks_position('top') # Putting the x-axis ticks in top border
+    FIGURES.append((station_annual_figure, (u_year.values, u_year.index.values, title),
+                    os.path.join(ROOTDIR, METADICT[key]['file']) + '_anual'))
 
-    # ax.axvline(0, linestyle = '--', color = 'gray', linewidth = 1) # Plotting a vertical line in position 0 of x-axis
-
-    # tendency_line_plot(u_year.values, u_year.index)
-
-    # plt.savefig(os.path.join(ROOTDIR, METADICT[key]['file']) + '_anual')
-    
-    # plt.close()
+    FIGURES.append((station_monthly_figure, (u_month.values, title),
+                    os.path.join(ROOTDIR, METADICT[key]['file']) + '_mensal'))
 
+    #### Plotting Data - Plots Together ####
 
-    # fig, ax = plt.subplots(figsize = (5, 3))
-
-    # u_month.plot(color = 'k')
-
-    # ax.set_title(u'{0} ({1} {2})'.format(METADICT[key]['name'], METADICT[key]['lat'], METADICT[key]['lon']), y = 1.02, fontweight = 'bold')
-
-    # ax.set_ylabel('Componente Zonal do Vento ($\mathregular{m.s^{-1}}$)')
-    # ax.set_xlabel('Meses')
-
-    # ax.axhline(0, linestyle = '--', color = 'gray', linewidth = 1) # Plotting a vertical line in position 0 of x-axis
 
-    # ax.set_xticks(np.arange(12))
-    # ax.set_xticklabels((MESES), rotation = False)
 
-    # plt.savefig(os.path.join(ROOTDIR, METADICT[key]['file']) + '_mensal')
+    # Comands to clear top and right borders of a plot
+    # ax1.spines['right'].set_visible(False)
+    # ax1.spines['top'].set_visible(False)
 
-    # plt.close()
 
-    #### Plotting Data - Plots Together ####
+##################################################################################################################################
+#### RENDERING ALL FIGURES #######################################################################################################
+##################################################################################################################################
 
+with stage('render'):
+    render_figures(FIGURES)
 
 
-    # Comands to clear top and right borders of a plot
-    # ax1.spines['right'].set_visible(False)
-    # ax1.spines['top'].set_visible(False)
+##################################################################################################################################
+#### TRENDS ######################################################################################################################
+##################################################################################################################################
+# Linear trends of all stations with resampling tests, which
+# unlike the linregress p-value hold for short and
+# autocorrelated series
 
+with stage('trends'):
+    write_table(trend_significance(pd.DataFrame(U_YEAR), seed = 0), os.path.join(ROOTDIR, 'tendencias.xlsx'))
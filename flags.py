@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Quality flags of the stations' monthly tables,
+#            where cells look like '5.2(3)', stored as integer
+#            bitmasks beside the values
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# Flag code n is stored as bit n, so a cell without
+# flag is 0 and uint16 holds codes from 0 to 15
+FLAG_DTYPE = np.uint16
+NBITS = np.iinfo(FLAG_DTYPE).bits
+
+NOFLAG = 0
+
+# A number ('5', '5.', '.5', '1e-05'), optionally followed
+# by its flag inside parentheses
+CELL_PATTERN = r'^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*(?:\((\d+)\))?\s*$'
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def flag_bits(codes):
+    """
+    Returns the bitmask with the bits of all flag codes set
+    """
+    bits = 0
+
+    for code in codes:
+        if not 0 <= int(code) < NBITS:
+            raise ValueError('Flag codes must be between 0 and {}, not {}'.format(NBITS - 1, code))
+
+        bits = bits | (1 << int(code))
+
+    return FLAG_DTYPE(bits)
+
+
+def parse_flagged(df):
+    """
+    Splits a table with cells like '5.2(3)' into values and
+    flags in one vectorized pass.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Cells may be numbers, NaN or 'value(flag)' strings
+
+    Returns
+    -------
+    values : pd.DataFrame
+        float values with the same index and columns of df
+    flags : np.ndarray
+        FLAG_DTYPE bitmask, NOFLAG where the cell has no flag.
+        Codes that don't fit in it are reported with a
+        warning and left out of the bitmask
+
+    Raises
+    ------
+    ValueError
+        When a cell is neither a number nor 'value(flag)'
+    """
+    raw = pd.Series(df.to_numpy(dtype=object).ravel())
+
+    # Plain numbers, in any form float() reads
+    numbers = pd.to_numeric(raw, errors='coerce').astype(float)
+
+    empty = raw.isna().to_numpy()
+
+    cells = raw.astype(str)
+    parts = cells.str.extract(CELL_PATTERN)
+
+    text = np.isnan(numbers.to_numpy()) & ~empty
+
+    bad = text & parts[0].isna().to_numpy()
+
+    if bad.any():
+        raise ValueError('Cells that are neither numbers nor value(flag): {}'.format(
+            sorted(set(cells[bad]))[:10]))
+
+    values = numbers.to_numpy().copy()
+    values[text] = parts[0][text].map(float).to_numpy()
+
+    codes = parts[1].astype(float).to_numpy().copy()
+    codes[~text] = np.nan
+
+    flagged = ~np.isnan(codes)
+    unknown = flagged & (codes >= NBITS)
+
+    if unknown.any():
+        warnings.warn('Flag codes {} can\'t be stored (codes must be lower than {}), {} cells left without flag'.format(
+            sorted(set(codes[unknown].astype(int).tolist())), NBITS, unknown.sum()))
+
+    flagged = flagged & ~unknown
+
+    flags = np.zeros(codes.shape, dtype=FLAG_DTYPE)
+    flags[flagged] = np.left_shift(1, codes[flagged].astype(int))
+
+    values = pd.DataFrame(values.reshape(df.shape), index=df.index, columns=df.columns)
+
+    return values, flags.reshape(df.shape)
+
+
+def flag_in(flags, codes):
+    """
+    Returns a boolean array, True where the flag is one of codes
+    """
+    return (np.asarray(flags) & flag_bits(codes)) != 0
+
+
+def mask_flagged(values, flags, codes):
+    """
+    Returns values with NaN where the flag is one of codes,
+    e.g. to mask suspect months before computing means
+    """
+    masked = flag_in(flags, codes)
+
+    if isinstance(values, pd.DataFrame):
+        return values.where(~masked)
+
+    return np.where(masked, np.nan, values)
+
+
+def flag_counts(flags, index=None, stations=None):
+    """
+    Counts the months with each flag code per year, and per
+    station, of a bitmask array.
+
+    Parameters
+    ----------
+    flags : np.ndarray
+        Bitmask array, a 2D (year, month) table or a 3D
+        (station, year, month) stack of them
+    index : sequence
+        Years, index of the table rows
+    stations : sequence
+        Station names of a 3D array
+
+    Returns
+    -------
+    pd.DataFrame with one row per (station, year) and one
+    column per flag code found
+    """
+    flags = np.asarray(flags, dtype=FLAG_DTYPE)
+
+    if flags.ndim == 2:
+        flags = flags[None]
+        stations = [None] if stations is None else stations
+
+    # (station, year, month, bit) array of 0 and 1
+    bits = (flags[..., None] >> np.arange(NBITS, dtype=FLAG_DTYPE)) & 1
+
+    counts = bits.sum(axis=2)
+
+    nstation, nyear = counts.shape[:2]
+
+    if index is None:
+        index = np.arange(nyear)
+    if stations is None:
+        stations = np.arange(nstation)
+
+    df = pd.DataFrame(
+        counts.reshape(nstation * nyear, NBITS),
+        index=pd.MultiIndex.from_product([stations, index], names=['station', 'year']),
+        columns=np.arange(NBITS))
+
+    df.columns.name = 'flag'
+
+    # Only codes found in some cell are kept
+    df = df.loc[:, df.sum(axis=0) > 0]
+
+    if nstation == 1 and stations[0] is None:
+        df.index = df.index.droplevel('station')
+
+    return df
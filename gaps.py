@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Gaps and coverage of the stations' time series
+#            to choose the analysis period of each one
+
+import numpy as np
+import pandas as pd
+
+from seasons import SEASONS, season_year
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+POLICIES = ['none', 'linear', 'time', 'climatology']
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def _run_edges(missing):
+    """
+    Returns (column, start, stop) arrays of each run of True
+    along the first axis of a 2D boolean array, with stop
+    being the first position after the run
+    """
+    T, N = missing.shape
+
+    padded = np.zeros((T + 2, N), dtype=np.int8)
+    padded[1:-1] = missing
+
+    # +1 where a gap starts and -1 where it ends. Transposing
+    # sorts the runs by column and then by time
+    change = np.diff(padded, axis=0).T
+
+    col, start = np.nonzero(change == 1)
+    _, stop = np.nonzero(change == -1)
+
+    return col, start, stop
+
+
+def gap_runs(df):
+    """
+    Run-length encoded list of the gaps (NaN runs) of all
+    columns of a regular time series DataFrame.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DatetimeIndex with fixed frequency, e.g. after
+        resample('MS').asfreq(), one column per series
+
+    Returns
+    -------
+    pd.DataFrame with series, start, end (last missing
+    time) and length (number of missing time steps)
+    """
+    col, start, stop = _run_edges(df.isna().to_numpy())
+
+    return pd.DataFrame({
+        'series': df.columns.values[col],
+        'start': df.index.values[start],
+        'end': df.index.values[stop - 1],
+        'length': stop - start,
+    })
+
+
+def gap_lengths(df):
+    """
+    Returns an array with the same shape of df where each
+    missing value holds the length of the gap it belongs
+    to and valid values hold 0
+    """
+    col, start, stop = _run_edges(df.isna().to_numpy())
+
+    # Adding the length at the start of each run and
+    # removing it after its end, the cumulative sum
+    # spreads it over the run
+    steps = np.zeros((df.shape[0] + 1, df.shape[1]), dtype=np.int64)
+    np.add.at(steps, (start, col), stop - start)
+    np.add.at(steps, (stop, col), -(stop - start))
+
+    return np.cumsum(steps, axis=0)[:-1]
+
+
+def coverage(df, by='year'):
+    """
+    Percent of valid values of each column per period.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DatetimeIndex with fixed frequency
+    by : str
+        'year', 'month' (calendar month over all years),
+        'season' (DJF, MAM, JJA and SON over all years) or
+        'year-season', where December belongs to the DJF of
+        the next year as in seasons.py
+
+    Returns
+    -------
+    pd.DataFrame with periods on index and series on columns
+    """
+    valid = df.notna()
+
+    year, season = season_year(df.index)
+
+    if by == 'year':
+        key = [df.index.year]
+    elif by == 'month':
+        key = [df.index.month]
+    elif by == 'season':
+        key = [season]
+    elif by == 'year-season':
+        key = [year, season]
+    else:
+        raise ValueError("by must be 'year', 'month', 'season' or 'year-season', not {}".format(by))
+
+    result = valid.groupby(key).mean() * 100.
+
+    # Grouped by season number, so seasons keep their
+    # chronological order, and then labelled
+    if by == 'season':
+        result.index = pd.Index(SEASONS[result.index], name='season')
+    elif by == 'year-season':
+        result.index = pd.MultiIndex.from_arrays([
+            result.index.get_level_values(0),
+            SEASONS[result.index.get_level_values(1)]],
+            names=['year', 'season'])
+
+    return result
+
+
+def gap_report(df):
+    """
+    Summary of the completeness of each column: first and
+    last valid times, percent coverage between them, number
+    of gaps and the longest one
+    """
+    runs = gap_runs(df)
+
+    valid = df.notna().to_numpy()
+    any_valid = valid.any(axis=0)
+
+    first = np.where(any_valid, valid.argmax(axis=0), 0)
+    last = np.where(any_valid, len(df) - 1 - valid[::-1].argmax(axis=0), -1)
+
+    span = last - first + 1
+
+    report = pd.DataFrame({
+        'first': np.where(any_valid, df.index.values[first], np.datetime64('NaT')),
+        'last': np.where(any_valid, df.index.values[last], np.datetime64('NaT')),
+        'coverage': np.where(span > 0, valid.sum(axis=0) / np.maximum(span, 1) * 100., 0.),
+    }, index=df.columns)
+
+    # Gaps before the first and after the last valid values
+    # aren't gaps of the record
+    inner = runs[
+        (runs.start > report.loc[runs.series, 'first'].values) &
+        (runs.end < report.loc[runs.series, 'last'].values)]
+
+    report['gaps'] = inner.groupby('series').size().reindex(df.columns).fillna(0).astype(int)
+    report['longest_gap'] = inner.groupby('series').length.max().reindex(df.columns).fillna(0).astype(int)
+
+    return report
+
+
+def fill_gaps(df, policy='none', max_gap=None):
+    """
+    Fills the gaps of all columns following an interpolation
+    policy, only for gaps up to max_gap time steps.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DatetimeIndex with fixed frequency
+    policy : str
+        'none' keeps the gaps, 'linear' interpolates over
+        positions, 'time' over the time index and
+        'climatology' uses the mean of the same calendar
+        month of the series
+    max_gap : int
+        Longest gap, in time steps, that is filled. Longer
+        ones are kept entirely, default fills all of them
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    if policy not in POLICIES:
+        raise ValueError('policy must be one of {}, not {}'.format(POLICIES, policy))
+
+    if policy == 'none':
+        return df.copy()
+
+    if policy == 'climatology':
+        clim = df.groupby(df.index.month).transform('mean')
+        filled = df.fillna(clim)
+    else:
+        filled = df.interpolate(method=policy, limit_area='inside')
+
+    if max_gap is not None:
+        filled = filled.where(gap_lengths(df) <= max_gap, df)
+
+    return filled
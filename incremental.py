@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Incremental update of monthly and annual
+#            aggregates of records that grow a month at a
+#            time, reading and processing only the new time
+#            steps
+
+import io
+import os
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+import cache
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+STATEDIR = os.path.join(cache.CACHEDIR, 'incremental')
+
+# Bytes hashed at the start and at the end of the part of a
+# file already read, to tell an appended file from a replaced
+# or edited one without reading all of it again
+BLOCK = 2**20
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+# The state of a source is its high-water mark (last time
+# step already processed), the sum and count of each
+# variable per (year, month) and, for sources read with
+# read_new_rows, the position in the file already read.
+# Means of any period can be updated in place adding the
+# sums and counts of new data
+
+def _state_path(source, statedir=None):
+    return os.path.join(statedir or STATEDIR, source + '.pkl')
+
+
+def load_state(source, statedir=None):
+    """
+    Returns the state dict of a source, with 'hwm',
+    'aggregates' and 'file', or an empty one on the first run
+    """
+    state = cache.load(_state_path(source, statedir))
+
+    if state is None:
+        state = {'hwm': None, 'aggregates': None, 'file': None}
+
+    return state
+
+
+def reset(source, statedir=None):
+    """
+    Forgets the state of a source, e.g. when old data was
+    corrected, so the next update processes everything again
+    """
+    path = _state_path(source, statedir)
+
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def high_water_mark(source, statedir=None):
+    """
+    Returns the last time step processed of a source or None
+    """
+    return load_state(source, statedir)['hwm']
+
+
+def new_steps(data, source, statedir=None, time='time'):
+    """
+    Returns only the time steps of data after the high-water
+    mark of source
+
+    Parameters
+    ----------
+    data : pd.DataFrame or xr.Dataset
+        DataFrame with DatetimeIndex or Dataset with a time
+        dimension. Slicing a lazy Dataset before reducing it
+        avoids reading the old steps from disk
+    """
+    hwm = high_water_mark(source, statedir)
+
+    if hwm is None:
+        return data
+
+    if isinstance(data, pd.DataFrame):
+        return data[data.index > hwm]
+
+    return data.isel({time: (data[time] > np.datetime64(hwm)).values})
+
+
+def _file_digest(path, offset, block=BLOCK):
+    """
+    sha1 of the first and last block bytes before offset
+    """
+    sha1 = hashlib.sha1()
+
+    with open(path, 'rb') as f:
+        sha1.update(f.read(min(block, offset)))
+
+        f.seek(max(offset - block, 0))
+        sha1.update(f.read(offset - max(offset - block, 0)))
+
+    return sha1.hexdigest()
+
+
+def read_new_rows(path, source, statedir=None, **kwargs):
+    """
+    Reads only the rows of a CSV file appended after the ones
+    already read for source, so a refresh parses one month
+    and not the whole record.
+
+    When the part already read changed (the file was replaced
+    or edited) the state of source is reset and the whole
+    file is read again. A last line still being written is
+    left for the next run.
+
+    Parameters
+    ----------
+    path : str
+        CSV file with a header line
+    source : str
+        Name of the record, see update
+    kwargs :
+        Passed to pd.read_csv
+
+    Returns
+    -------
+    df : pd.DataFrame
+        New rows, with the columns of the header
+    position : dict
+        Part of the file read, to give to update with the
+        aggregates of df
+    """
+    position = load_state(source, statedir).get('file')
+
+    size = os.path.getsize(path)
+
+    if position is not None and not (
+            position['path'] == os.path.abspath(path) and
+            position['offset'] <= size and
+            position['digest'] == _file_digest(path, position['offset'])):
+        reset(source, statedir)
+        position = None
+
+    with open(path, 'rb') as f:
+        if position is None:
+            header = f.readline()
+        else:
+            header = position['header']
+            f.seek(position['offset'])
+
+        start = f.tell()
+        data = f.read()
+
+    # Only complete lines
+    data = data[:data.rfind(b'\n') + 1]
+
+    df = pd.read_csv(io.BytesIO(header + data), header=0, **kwargs)
+
+    offset = start + len(data)
+
+    return df, {
+        'path': os.path.abspath(path),
+        'offset': offset,
+        'digest': _file_digest(path, offset),
+        'header': header,
+    }
+
+
+def update(source, df, statedir=None, position=None):
+    """
+    Adds the time steps of df after the high-water mark of
+    source to its stored aggregates.
+
+    Parameters
+    ----------
+    source : str
+        Name of the record, e.g. 'nrl2_ssi'
+    df : pd.DataFrame
+        DatetimeIndex and one column per variable. It may
+        have all the record or only its new steps
+    position : dict
+        Part of the file read, from read_new_rows, stored with
+        the aggregates
+
+    Returns
+    -------
+    aggregates : pd.DataFrame
+        (year, month) index and (variable, 'sum'/'count')
+        columns, see monthly_mean, annual_mean and
+        year_month_table. None while there's no data
+    """
+    state = load_state(source, statedir)
+
+    if state['hwm'] is not None:
+        df = df[df.index > state['hwm']]
+
+    if position is not None:
+        state['file'] = position
+
+    if len(df) > 0:
+        new = df.groupby([df.index.year, df.index.month]).agg(['sum', 'count'])
+        new.index.names = ['year', 'month']
+
+        if state['aggregates'] is None:
+            aggregates = new
+        else:
+            aggregates = state['aggregates'].add(new, fill_value=0)
+
+        state['aggregates'] = aggregates.sort_index()
+        state['hwm'] = df.index.max()
+
+    elif position is None:
+        return state['aggregates']
+
+    cache.store(_state_path(source, statedir), state)
+
+    return state['aggregates']
+
+
+def _split(aggregates):
+    sums = aggregates.xs('sum', axis=1, level=1)
+    counts = aggregates.xs('count', axis=1, level=1)
+
+    return sums, counts
+
+
+def monthly_mean(aggregates):
+    """
+    Monthly means with a continuous month start index, like
+    resample('MS').mean(), empty while there's no data
+    """
+    if aggregates is None:
+        return pd.DataFrame(index=pd.DatetimeIndex([], freq='MS'))
+
+    sums, counts = _split(aggregates)
+
+    mean = sums / counts.where(counts > 0)
+
+    mean.index = pd.to_datetime(pd.DataFrame({
+        'year': mean.index.get_level_values('year'),
+        'month': mean.index.get_level_values('month'),
+        'day': 1}))
+
+    return mean.asfreq('MS')
+
+
+def annual_mean(aggregates):
+    """
+    Annual means weighting each month by its number of values
+    """
+    if aggregates is None:
+        return pd.DataFrame()
+
+    sums, counts = _split(aggregates)
+
+    sums = sums.groupby(level='year').sum()
+    counts = counts.groupby(level='year').sum()
+
+    return sums / counts.where(counts > 0)
+
+
+def year_month_table(aggregates):
+    """
+    Monthly means with years on rows and (variable, month)
+    on columns, as the scripts save them, empty while there's
+    no data
+    """
+    if aggregates is None:
+        return pd.DataFrame()
+
+    sums, counts = _split(aggregates)
+
+    table = sums / counts.where(counts > 0)
+    table.index.names = ['', '']
+
+    return table.unstack()
@@ -13,9 +13,14 @@
 # OBJECTIVE: Tranforming Julian data for Bia
  
 import os
+import numpy as np
 import pandas as pd
 
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from incremental import load_state, monthly_mean, read_new_rows, update, year_month_table
+from output import append_table, write_table
+from profiling import stage
 
 start = datetime.now().replace(microsecond = 0)
 ##############################################################################
@@ -30,9 +35,19 @@ if os.path.expanduser('~') == '/home/douglasnehme':
 # OPENNING AND MANIPULATING DATA #############################################
 ##############################################################################
 
-# Open files
-ssi = pd.read_csv(os.path.join(ROOTDIR, 'nrl2_ssi_P1D-279nm-1882-2017-daily'), header=0)
-tsi = pd.read_csv(os.path.join(ROOTDIR, 'nrl2_tsi_P1D-1882a2017-daily'), header=0)
+SSI_FILE = os.path.join(ROOTDIR, 'nrl2_ssi_P1D-279nm-1882-2017-daily')
+TSI_FILE = os.path.join(ROOTDIR, 'nrl2_tsi_P1D-1882a2017-daily')
+
+# Open files, only the rows added after the last run. When a
+# file was replaced all of it is read again
+with stage('read_csv'):
+    ssi, ssi_position = read_new_rows(SSI_FILE, 'nrl2_ssi')
+    tsi, tsi_position = read_new_rows(TSI_FILE, 'nrl2_tsi')
+
+# First run or file replaced, so the daily tables are
+# written again instead of appended
+ssi_new = load_state('nrl2_ssi')['aggregates'] is None
+tsi_new = load_state('nrl2_tsi')['aggregates'] is None
 
 # Setting columns name by Emilia Correia information
 # julian = days since 1610-01-01
@@ -42,52 +57,47 @@ tsi = pd.read_csv(os.path.join(ROOTDIR, 'nrl2_tsi_P1D-1882a2017-daily'), header=
 ssi.columns = ['julian', 'wavelength', 'irradiance', 'error']
 tsi.columns = ['julian', 'irradiance', 'error']
 
-# Calculate datetime dates from julian dates
-start_julian = datetime(1610, 1, 1) 
-
-datetime_index = []
-
-for i in range(len(ssi)):
-    delta = timedelta(ssi.julian[i])
-    datetime_index.append(start_julian + delta)
-
-ssi.index = datetime_index
-ssi.index.name = 'datetime'
+# Calculate datetime dates from julian dates. The origin
+# is out of pandas nanosecond range, so the sum is done by
+# numpy in microseconds
+start_julian = np.datetime64('1610-01-01', 'us')
 
+with stage('julian_dates'):
+    ssi.index = pd.DatetimeIndex(start_julian + (ssi.julian.values * 86400e6).astype('timedelta64[us]'))
+    ssi.index.name = 'datetime'
 
-datetime_index = []
+    tsi.index = pd.DatetimeIndex(start_julian + (tsi.julian.values * 86400e6).astype('timedelta64[us]'))
+    tsi.index.name = 'datetime'
 
-for i in range(len(tsi)):
-    delta = timedelta(tsi.julian[i])
-    datetime_index.append(start_julian + delta)
+# The new days are added to the stored monthly sums and
+# counts, together with the part of the files read
+with stage('aggregates'):
+    ssi_aggregates = update('nrl2_ssi', ssi, position=ssi_position)
+    tsi_aggregates = update('nrl2_tsi', tsi, position=tsi_position)
 
-tsi.index = datetime_index
-tsi.index.name = 'datetime'
-
-
-ssi_monthly = ssi.resample('MS').mean()
-tsi_monthly = tsi.resample('MS').mean()
+    ssi_monthly = monthly_mean(ssi_aggregates)
+    tsi_monthly = monthly_mean(tsi_aggregates)
 
 ##########################################################
 # Transforming index from a monthly series from 01/1882 to 
 # 12/2017 over all rows length to a yearly series over all
 # rows length and monthly variations on columns dimension
-ssi_monthly_groupedby = ssi_monthly.groupby([ssi_monthly.index.year, ssi_monthly.index.month]).mean()
-tsi_monthly_groupedby = tsi_monthly.groupby([tsi_monthly.index.year, tsi_monthly.index.month]).mean()
-
-ssi_monthly_groupedby.index.names = ['', '']
-tsi_monthly_groupedby.index.names = ['', '']
-
-ssi_monthly_groupedby = ssi_monthly_groupedby.unstack()
-tsi_monthly_groupedby = tsi_monthly_groupedby.unstack()
+with stage('year_month_tables'):
+    ssi_monthly_groupedby = year_month_table(ssi_aggregates)
+    tsi_monthly_groupedby = year_month_table(tsi_aggregates)
 ##########################################################
 
 # Save
-ssi.to_csv(os.path.join(ROOTDIR, 'nrl2_ssi_P1D-279nm-1882-2017-daily_NEW.csv'))
-tsi.to_csv(os.path.join(ROOTDIR, 'nrl2_tsi_P1D-1882a2017-daily_NEW.csv'))
+with stage('write'):
+    append_table(ssi, os.path.join(ROOTDIR, 'nrl2_ssi_P1D-279nm-1882-2017-daily_NEW.csv'), new=ssi_new)
+    append_table(tsi, os.path.join(ROOTDIR, 'nrl2_tsi_P1D-1882a2017-daily_NEW.csv'), new=tsi_new)
+
+    write_table(ssi_monthly, os.path.join(ROOTDIR, 'nrl2_ssi_P1D-279nm-1882-2017-monthly_NEW.csv'))
+    write_table(tsi_monthly, os.path.join(ROOTDIR, 'nrl2_tsi_P1D-1882a2017-monthly_NEW.csv'))
+
+    write_table(ssi_monthly_groupedby, os.path.join(ROOTDIR, 'nrl2_ssi_P1D-279nm-1882-2017-monthly_groupedby_NEW.csv'))
+    write_table(tsi_monthly_groupedby, os.path.join(ROOTDIR, 'nrl2_tsi_P1D-1882a2017-monthly_groupedby_NEW.csv'))
 
-ssi_monthly.to_csv(os.path.join(ROOTDIR, 'nrl2_ssi_P1D-279nm-1882-2017-monthly_NEW.csv'))
-tsi_monthly.to_csv(os.path.join(ROOTDIR, 'nrl2_tsi_P1D-1882a2017-monthly_NEW.csv'))
+stop = datetime.now().replace(microsecond=0)
 
-ssi_monthly_groupedby.to_csv(os.path.join(ROOTDIR, 'nrl2_ssi_P1D-279nm-1882-2017-monthly_groupedby_NEW.csv'))
-tsi_monthly_groupedby.to_csv(os.path.join(ROOTDIR, 'nrl2_tsi_P1D-1882a2017-monthly_groupedby_NEW.csv'))
\ No newline at end of file
+print('Time taken to execute program: {}'.format(stop - start))
@@ -16,9 +16,12 @@ import matplotlib as mpl
 import matplotlib.pyplot as plt
 
 from matplotlib.patches import Polygon
-from mpl_toolkits.basemap import Basemap
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 
+from stations import site_dict
+from mapping import cached_basemap, footprint, project_polygons
+from profiling import stage
+
 ##################################################################################################################################
 #### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
 ##################################################################################################################################
@@ -26,24 +29,10 @@ from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 ROOTDIR = '/home/dnehme/Desktop/bia/arquivos'
 
 
-METADICT = {
-'lago'           : { 'lon': -58.88, 'lat': -62.183, 'name': 'Profound Lake'           },
-'bellingshausen' : { 'lon': -59.  , 'lat': -62.2  , 'name': 'Bellingshausen'          },
-'marion'         : { 'lon': 37.9  , 'lat': -46.9  , 'name': 'Marion Island'           },
-'amsterdam'      : { 'lon': 77.5  , 'lat': -37.8  , 'name': 'Ile Nouvelle\nAmsterdam' },
-'hobart'         : { 'lon': 147.3 , 'lat': -42.9  , 'name': 'Hobart'                  },
-'christchurch'   : { 'lon': 172.6 , 'lat': -43.5  , 'name': 'Christchurch'            },
-'puerto_montt'   : { 'lon': -73.1 , 'lat': -39.6  , 'name': 'Puerto\nMontt'           },
-'gough'          : { 'lon': -9.9  , 'lat': -40.4  , 'name': 'Gough Island'            },
-'novolazara'     : { 'lon': 11.8  , 'lat': -70.8  , 'name': 'Novolazarevskaya'        },
-'mawson'         : { 'lon': 62.9  , 'lat': -67.6  , 'name': 'Mawson'                  },
-'mirny'          : { 'lon': 93.0  , 'lat': -66.6  , 'name': 'Mirny'                   },
-'casey'          : { 'lon': 110.5 , 'lat': -66.3  , 'name': 'Casey'                   },
-'dumont'         : { 'lon': 140.0 , 'lat': -66.7  , 'name': u'Dumont D’urville'       },
-'faraday'        : { 'lon': -64.3 , 'lat': -65.2  , 'name': 'Faraday'                 },
-'vernadsky'      : { 'lon': -64.25, 'lat': -65.25 , 'name': 'Vernadsky'               },
-'palmer'         : { 'lon': -64.05, 'lat': -64.767, 'name': 'Palmer'                  },
-}
+METADICT = site_dict([
+    'lago', 'bellingshausen', 'marion', 'amsterdam', 'hobart', 'christchurch',
+    'puerto_montt', 'gough', 'novolazara', 'mawson', 'mirny', 'casey', 'dumont',
+    'faraday', 'vernadsky', 'palmer'])
 
 
 mpl.rcParams['font.weight'] = 'bold'
@@ -62,12 +51,10 @@ mpl.rcParams['savefig.format'] = 'jpeg'
 #### PLOTTING RIGHT MAP ##########################################################################################################
 ##################################################################################################################################
 
-merra2_lon = (-63.30, -63.30, -58.00, -58.00)
-merra2_lat = (-63.00, -62.00, -62.00, -63.00)
-twenty_lon = (-59.00, -59.00, -58.00, -58.00)
-twenty_lat = (-63.00, -62.00, -62.00, -63.00)
-era5_lon = (-59.30, -59.30, -57.40, -57.40)
-era5_lat = (-62.50, -61.80, -61.80, -62.50)
+# Reanalysis boxes as (west, east) and (south, north)
+merra2_lon, merra2_lat = footprint((-63.30, -58.00), (-63.00, -62.00))
+twenty_lon, twenty_lat = footprint((-59.00, -58.00), (-63.00, -62.00))
+era5_lon, era5_lat = footprint((-59.30, -57.40), (-62.50, -61.80))
 
 fig, [ax1, ax2] = plt.subplots(nrows = 1, ncols = 2)
 
@@ -77,8 +64,9 @@ fig, [ax1, ax2] = plt.subplots(nrows = 1, ncols = 2)
 
 lat_0, lon_0 = -62.5, -60.5
 
-m2 = Basemap(width = 330000, height = 220000, resolution = 'f', projection = 'laea',
-            lat_ts = lat_0, lat_0 = lat_0, lon_0 = lon_0, ax = ax2)
+with stage('basemap_island'):
+    m2 = cached_basemap(width = 330000, height = 220000, resolution = 'f', projection = 'laea',
+                       lat_ts = lat_0, lat_0 = lat_0, lon_0 = lon_0, ax = ax2)
 
 m2.drawparallels(np.arange(-63.5, -61.5, 0.5), labels = [False, True, False, False], 
                 color = 'gray', linewidth = 0)
@@ -113,13 +101,16 @@ ax2.annotate(METADICT['bellingshausen']['name'], (0.63, 0.65), xycoords = 'axes
 m2.plot([-58.86, -58.76], [-62.22, -62.315], color = 'k', linewidth = 1, latlon = True, zorder = 3)
 
 
-# mx, my = m2(merra2_lon, merra2_lat)
-# mxy = list(zip(mx, my))
-mxy = [
-    (23698.10185438237, 51957.97097811287),
-    (23698.10185438237, 163074.8576896538),
-    (295473.6435049328, 163074.8576896538),
-    (295473.6435049328, 51957.97097811287)]
+# Box corners in map coordinates, all transformed in one
+# call and memoized on disk for this projection
+with stage('footprints'):
+    footprints = project_polygons(m2, {
+        'merra2': (merra2_lon, merra2_lat),
+        'twenty': (twenty_lon, twenty_lat),
+        'era5': (era5_lon, era5_lat),
+    })
+
+mxy = footprints['merra2']
 
 merra_polygon = Polygon(
     mxy,
@@ -129,13 +120,7 @@ merra_polygon = Polygon(
     zorder=3)
 m2.ax.add_patch(merra_polygon)
 
-# tx, ty = m2(twenty_lon, twenty_lat)
-# txy = list(zip(tx, ty))
-txy = [
-    (243297.5020316471, 53522.56142991928),
-    (243297.5020316471, 164689.1333857780),
-    (298473.6435049328, 164689.1333857780),
-    (298473.6435049328, 53522.56142991928)]
+txy = footprints['twenty']
 twenty_polygon = Polygon(
     txy,
     edgecolor='g',
@@ -144,13 +129,7 @@ twenty_polygon = Polygon(
     zorder=3)
 m2.ax.add_patch(twenty_polygon)
 
-# ex, ey = m2(era5_lon, era5_lat)
-# exy = list(zip(ex, ey))
-exy = [
-    (228051.5885396924, 109427.70710035652),
-    (228051.5885396924, 187251.16695777007),
-    (327826.7655075394, 187251.16695777007),
-    (327826.7655075394, 109427.70710035652)]
+exy = footprints['era5']
 era5_polygon = Polygon(
     exy,
     edgecolor='b',
@@ -166,8 +145,9 @@ m2.ax.add_patch(era5_polygon)
 # lat_ts is latitude of true scale.
 # lon_0,lat_0 is central point.
 
-m1 = Basemap(width = 12000000, height = 12000000, resolution = 'h', projection = 'laea',
-             lat_ts = -60, lat_0 = -90, lon_0 = 0, ax = ax1)
+with stage('basemap_antarctica'):
+    m1 = cached_basemap(width = 12000000, height = 12000000, resolution = 'h', projection = 'laea',
+                        lat_ts = -60, lat_0 = -90, lon_0 = 0, ax = ax1)
 
 m1.drawparallels(np.arange(-80.,81.,20), labels = [False, False, False, False], dashes = [0.01, 0.01], color = 'gray', zorder = 1)
 m1.drawmeridians(np.arange(-180.,181.,20), labels = [False, False, True, True], dashes = [0.01, 0.01], color = 'gray', zorder = 1)
@@ -237,5 +217,6 @@ ax1.annotate(METADICT['vernadsky']['name'], (0.22, 0.56), xycoords = 'axes fract
 ax1.annotate(METADICT['palmer']['name'], (0.375, 0.56), color='r', xycoords = 'axes fraction', horizontalalignment = 'center')
 
 
-plt.savefig(os.path.join(ROOTDIR, u'map_data_distribuition_article'))
-plt.close('all')
\ No newline at end of file
+with stage('savefig'):
+    plt.savefig(os.path.join(ROOTDIR, u'map_data_distribuition_article'))
+    plt.close('all')
\ No newline at end of file
@@ -16,9 +16,12 @@ import matplotlib as mpl
 import matplotlib.pyplot as plt
 
 from matplotlib.patches import Polygon
-from mpl_toolkits.basemap import Basemap
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 
+from stations import site_dict
+from mapping import cached_basemap
+from profiling import stage
+
 ##################################################################################################################################
 #### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
 ##################################################################################################################################
@@ -26,25 +29,11 @@ from mpl_toolkits.axes_grid1.inset_locator import inset_axes
 ROOTDIR = '/home/dnehme/Desktop/bia'
 
 
-METADICT = {
-'lago'           : { 'lon': -58.88, 'lat': -62.183, 'name': 'Glubokoe Deepe'                 },
-'reanalise'      : { 'lon': -62.5 , 'lat': -62.5  , 'name': u'Reanálise 1\nNCEP/NCAR'        },
-'bellingshausen' : { 'lon': -59.  , 'lat': -62.2  , 'name': 'Bellingshausen'                 },
-'deception'      : { 'lon': -60.7 , 'lat': -63.   , 'name': 'Deception'                      },
-'halley'         : { 'lon': -26.6 , 'lat': -75.58 , 'name': 'Halley'                         },
-'marion'         : { 'lon': 37.9  , 'lat': -46.9  , 'name': 'Marion Island'                  },
-'amsterdam'      : { 'lon': 77.5  , 'lat': -37.8  , 'name': 'Ile Nouvelle\nAmsterdam'        },
-'hobart'         : { 'lon': 147.3 , 'lat': -42.9  , 'name': 'Hobart'                         },
-'christchurch'   : { 'lon': 172.6 , 'lat': -43.5  , 'name': 'Christchurch'                   },
-'valdivia'       : { 'lon': -73.1 , 'lat': -39.6  , 'name': 'Valdivia'                       },
-'gough'          : { 'lon': -9.9  , 'lat': -40.4  , 'name': 'Gough Island'                   },
-'novolazara'     : { 'lon': 11.8  , 'lat': -70.8  , 'name': 'Novolazarevskaya'               },
-'mawson'         : { 'lon': 62.9  , 'lat': -67.6  , 'name': 'Mawson'                         },
-'mirny'          : { 'lon': 93.0  , 'lat': -66.6  , 'name': 'Mirny'                          },
-'casey'          : { 'lon': 110.5 , 'lat': -66.3  , 'name': 'Casey'                          },
-'dumont'         : { 'lon': 140.0 , 'lat': -66.7  , 'name': u'Dumont D’urville'              },
-'faraday'        : { 'lon': -64.3 , 'lat': -65.2  , 'name': 'Faraday'                        },
-}
+METADICT = site_dict([
+    'lago', 'reanalise', 'bellingshausen', 'deception', 'halley', 'marion',
+    'amsterdam', 'hobart', 'christchurch', 'valdivia', 'gough', 'novolazara',
+    'mawson', 'mirny', 'casey', 'dumont', 'faraday'],
+    lago='Glubokoe Deepe')
 
 
 mpl.rcParams['font.weight'] = 'bold'
@@ -71,8 +60,9 @@ fig, [ax1, ax2] = plt.subplots(nrows = 1, ncols = 2)
 
 lat_0, lon_0 = -62.5, -60.
 
-m = Basemap(width = 330000, height = 220000, resolution = 'f', projection = 'laea',
-            lat_ts = lat_0, lat_0 = lat_0, lon_0 = lon_0, ax = ax2)
+with stage('basemap_island'):
+    m = cached_basemap(width = 330000, height = 220000, resolution = 'f', projection = 'laea',
+                       lat_ts = lat_0, lat_0 = lat_0, lon_0 = lon_0, ax = ax2)
 
 m.drawparallels(np.arange(-63.5, -61.5, 0.5), labels = [False, True, False, False], 
                 color = 'gray', linewidth = 0)
@@ -125,8 +115,9 @@ m.plot([-58.86, -58.76], [-62.22, -62.315], color = 'k', linewidth = 1, latlon =
 # lat_ts is latitude of true scale.
 # lon_0,lat_0 is central point.
 
-m2 = Basemap(width = 12000000, height = 12000000, resolution = 'h', projection = 'laea',
-             lat_ts = -60, lat_0 = -90, lon_0 = 0, ax = ax1)
+with stage('basemap_antarctica'):
+    m2 = cached_basemap(width = 12000000, height = 12000000, resolution = 'h', projection = 'laea',
+                        lat_ts = -60, lat_0 = -90, lon_0 = 0, ax = ax1)
 
 m2.drawparallels(np.arange(-80.,81.,20), labels = [False, False, False, False], dashes = [0.01, 0.01], color = 'gray', zorder = 1)
 m2.drawmeridians(np.arange(-180.,181.,20), labels = [False, False, True, True], dashes = [0.01, 0.01], color = 'gray', zorder = 1)
@@ -190,4 +181,5 @@ ax1.annotate(METADICT['faraday']['name'], (0.26, 0.56), xycoords = 'axes fractio
 
 
 # plt.show()
-plt.savefig(os.path.join(ROOTDIR, u'mapa estações dissertação'))
\ No newline at end of file
+with stage('savefig'):
+    plt.savefig(os.path.join(ROOTDIR, u'mapa estações dissertação'))
\ No newline at end of file
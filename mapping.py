@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Helpers shared by the map scripts
+
+import numpy as np
+
+from mpl_toolkits.basemap import Basemap
+
+import cache
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# Antarctic Peninsula domain as (llcrnrlat, urcrnrlat, llcrnrlon, urcrnrlon)
+PENINSULA = (-75.0, -58.0, -80.0, -50.0)
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def cached_basemap(ax=None, **kwargs):
+    """
+    Returns a Basemap built with kwargs, reusing the one
+    pickled in the cache by a previous run with the same
+    projection, extent and resolution.
+
+    Building a Basemap with resolution='f' clips and
+    projects the full resolution GSHHS coastlines, which
+    takes from seconds to minutes. The pickled instance
+    already has the clipped and projected coastline and
+    land polygons, so only the first run pays for it.
+
+    Parameters
+    ----------
+    ax : matplotlib axes
+        Axes where the map is drawn, it isn't part of the
+        cache key
+    kwargs
+        Any Basemap keyword, e.g. projection, llcrnrlat,
+        resolution and area_thresh
+    """
+    path = cache.cache_path('basemap', cache.cache_key(**kwargs))
+
+    m = cache.load(path)
+
+    if m is None:
+        m = Basemap(**kwargs)
+        cache.store(path, m)
+
+    m.ax = ax
+
+    return m
+
+
+def projection_key(m):
+    """
+    Returns a cache key of the projection definition of a
+    Basemap, i.e. its proj4 parameters and map corners
+    """
+    return cache.cache_key(
+        m.projparams,
+        m.llcrnrx, m.llcrnry,
+        m.urcrnrx, m.urcrnry)
+
+
+def footprint(lon, lat):
+    """
+    Returns the corners of a lon x lat box in the order used
+    to draw its Polygon: lower left, upper left, upper right
+    and lower right
+
+    Parameters
+    ----------
+    lon : tuple
+        (west, east) longitudes
+    lat : tuple
+        (south, north) latitudes
+    """
+    return (
+        (lon[0], lon[0], lon[1], lon[1]),
+        (lat[0], lat[1], lat[1], lat[0]))
+
+
+def project_polygons(m, polygons):
+    """
+    Transforms station points and reanalysis footprints into
+    map coordinates of m with only one call to the
+    projection, memoizing the result on disk by projection
+    parameters and input coordinates.
+
+    Parameters
+    ----------
+    m : Basemap
+    polygons : dict
+        Names and (lons, lats) sequences, like the ones
+        returned by footprint
+
+    Returns
+    -------
+    dict with the same keys and lists of (x, y) tuples,
+    ready to build matplotlib.patches.Polygon
+    """
+    names = sorted(polygons)
+
+    lons = [np.asarray(polygons[name][0], dtype=float).ravel() for name in names]
+    lats = [np.asarray(polygons[name][1], dtype=float).ravel() for name in names]
+
+    path = cache.cache_path(
+        'projection',
+        cache.cache_key(
+            projection_key(m),
+            names,
+            [lon.tolist() for lon in lons],
+            [lat.tolist() for lat in lats]))
+
+    projected = cache.load(path)
+
+    if projected is None:
+        x, y = m(np.concatenate(lons), np.concatenate(lats))
+
+        projected = {}
+        start = 0
+
+        for name, lon in zip(names, lons):
+            stop = start + len(lon)
+            projected[name] = list(zip(
+                np.asarray(x[start:stop]).tolist(),
+                np.asarray(y[start:stop]).tolist()))
+            start = stop
+
+        cache.store(path, projected)
+
+    return projected
+
+
+def draw_field(m, lon, lat, field, method='mesh', points=False, **kwargs):
+    """
+    Draws a gridded field on a Basemap as a raster, instead
+    of the one patch per cell of pcolor.
+
+    Parameters
+    ----------
+    m : Basemap
+    lon, lat : np.ndarray
+        1D coordinates of a regular grid
+    field : np.ndarray
+        2D (lat, lon) values
+    method : str
+        'mesh' draws the projected grid with pcolormesh, a
+        single QuadMesh whatever the number of cells.
+        'image' interpolates the field into a regular grid
+        of the map projection and draws it with imshow,
+        the fastest one for large domains
+    points : bool
+        Plots a marker at each grid point, as the scripts
+        did over pcolor. It gets slow for large grids
+    kwargs
+        Passed to pcolormesh or imshow, e.g. cmap, vmin, vmax
+
+    Returns
+    -------
+    mappable to build the colorbar
+    """
+    lon = np.asarray(lon, dtype=float)
+    lat = np.asarray(lat, dtype=float)
+    field = np.ma.masked_invalid(np.asarray(field, dtype=float))
+
+    # transform_scalar and the cell edges need increasing
+    # coordinates, but ERA5 latitudes are north to south
+    if lat[0] > lat[-1]:
+        lat = lat[::-1]
+        field = field[::-1]
+
+    if method == 'mesh':
+        x, y = m(*np.meshgrid(lon, lat))
+        mappable = m.pcolormesh(x, y, field, shading='nearest', **kwargs)
+
+    elif method == 'image':
+        # One map pixel per grid point keeps the resolution
+        # of the original grid
+        ny, nx = field.shape
+        image = m.transform_scalar(field, lon, lat, nx, ny, masked=True)
+        mappable = m.imshow(image, interpolation='nearest', **kwargs)
+
+    else:
+        raise ValueError("method must be 'mesh' or 'image', not {}".format(method))
+
+    if points:
+        x, y = m(*np.meshgrid(lon, lat))
+        m.scatter(x, y, c=field, s=10, zorder=99,
+                  cmap=mappable.get_cmap(), norm=mappable.norm)
+
+    return mappable
@@ -0,0 +1,406 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Output layer shared by the processing scripts
+#            to save tables as xlsx, Parquet, Feather or
+#            compressed CSV
+
+import os
+import gzip
+import math
+
+import numpy as np
+import pandas as pd
+
+from datetime import datetime
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# Format used by all scripts in a run, e.g.
+# ANNABIA_OUTPUT_FORMAT=parquet python era5.py
+# When it isn't set each script keeps the format
+# given by the extension of its output file
+OUTPUT_FORMAT = os.environ.get('ANNABIA_OUTPUT_FORMAT')
+
+# Time steps reduced and written at a time by export_reduced,
+# one year of hourly data
+CHUNK = 8760
+
+EXTENSIONS = {
+    'xlsx': '.xlsx',
+    'parquet': '.parquet',
+    'feather': '.feather',
+    'csv': '.csv',
+    'csv.gz': '.csv.gz',
+}
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def metadata_columns(ds, coords=('lat', 'lon', 'latitude', 'longitude', 'time', 'time_bnds')):
+    """
+    Returns a dict to rename the variables of a xr.Dataset
+    into columns that retain long_name and units info, like
+    '10_metre_U_wind_component-(m.s**-1)'
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+    coords : tuple
+        Variables that aren't renamed
+    """
+    names = {}
+
+    for var in ds.variables.keys():
+        if var in coords:
+            continue
+
+        names[var] = (
+            ds[var].long_name.replace(' ', '_') +
+            '-(' + ds[var].units.replace(' ', '.') + ')')
+
+    return names
+
+
+def output_format(path, fmt=None):
+    """
+    Returns the format used to save path: fmt, else
+    OUTPUT_FORMAT, else the one given by path extension
+    """
+    if fmt is None:
+        fmt = OUTPUT_FORMAT
+
+    if fmt is None:
+        for name, ext in sorted(EXTENSIONS.items(), key=lambda item: -len(item[1])):
+            if path.endswith(ext):
+                return name
+
+        raise ValueError('Unknown output format for {}'.format(path))
+
+    if fmt not in EXTENSIONS:
+        raise ValueError(
+            'fmt must be one of {}, not {}'.format(sorted(EXTENSIONS), fmt))
+
+    return fmt
+
+
+def output_path(path, fmt):
+    """
+    Replaces path extension by the one of fmt
+    """
+    for ext in sorted(EXTENSIONS.values(), key=len, reverse=True):
+        if path.endswith(ext):
+            path = path[:-len(ext)]
+            break
+
+    return path + EXTENSIONS[fmt]
+
+
+def flat_table(df):
+    """
+    Returns a copy of df with string column names and a
+    default index, as needed by Parquet and Feather.
+
+    MultiIndex columns, like year x month tables from
+    unstack, are joined with '_' and unnamed index levels
+    are called 'index', 'index_1', ...
+    """
+    df = df.copy(deep=False)
+
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = ['_'.join(str(level) for level in col) for col in df.columns]
+    else:
+        df.columns = [str(col) for col in df.columns]
+
+    if isinstance(df.index, pd.PeriodIndex):
+        df.index = df.index.to_timestamp()
+
+    df.index.names = [
+        name if name else ('index' if i == 0 else 'index_{}'.format(i))
+        for i, name in enumerate(df.index.names)]
+
+    return df.reset_index()
+
+
+def _xlsx_cell(worksheet, row, col, value, date_format):
+    """
+    Writes one cell in the type xlsxwriter expects,
+    leaving NaN cells empty
+    """
+    if isinstance(value, pd.Period):
+        value = value.to_timestamp()
+
+    if isinstance(value, (datetime, np.datetime64)):
+        if pd.isnull(value):
+            return
+
+        worksheet.write_datetime(row, col, pd.Timestamp(value).to_pydatetime(), date_format)
+
+    elif isinstance(value, (float, np.floating)):
+        if not math.isnan(value):
+            worksheet.write_number(row, col, value)
+
+    elif isinstance(value, (int, np.integer)):
+        worksheet.write_number(row, col, value)
+
+    else:
+        worksheet.write(row, col, str(value))
+
+
+def write_xlsx(df, path):
+    """
+    Writes df as xlsx with xlsxwriter in constant memory
+    mode, where each row is flushed to disk as soon as the
+    next one starts. The layout follows DataFrame.to_excel:
+    one header row per column level and the index on the
+    first columns.
+
+    Requirements
+    ------------
+    NEED XLSXWRITER MODULE INSTALLED
+    """
+    write_xlsx_chunks([df], path)
+
+
+def write_xlsx_chunks(chunks, path):
+    """
+    write_xlsx of DataFrames with the same columns given one
+    after the other, with the header of the first one
+
+    Requirements
+    ------------
+    NEED XLSXWRITER MODULE INSTALLED
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    worksheet = workbook.add_worksheet()
+
+    date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+
+    r = None
+
+    for df in chunks:
+        nidx = df.index.nlevels
+
+        if r is None:
+            columns = df.columns
+            if not isinstance(columns, pd.MultiIndex):
+                columns = pd.MultiIndex.from_arrays([columns])
+
+            for r in range(columns.nlevels):
+                for c, value in enumerate(columns.get_level_values(r), start=nidx):
+                    _xlsx_cell(worksheet, r, c, value, date_format)
+
+            r = columns.nlevels
+
+        for row in df.itertuples(index=True, name=None):
+            index = row[0] if nidx > 1 else (row[0],)
+
+            for c, value in enumerate(tuple(index) + row[1:]):
+                _xlsx_cell(worksheet, r, c, value, date_format)
+
+            r = r + 1
+
+    workbook.close()
+
+
+def write_table(df, path, fmt=None):
+    """
+    Saves a DataFrame in the format selected for the run
+    (see OUTPUT_FORMAT) and returns the path written, whose
+    extension always matches the format.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+    path : str
+        Output file, e.g. os.path.join(ROOTDIR, 'era5_shetland.csv')
+    fmt : str
+        'xlsx', 'parquet', 'feather', 'csv' or 'csv.gz'
+
+    Requirements
+    ------------
+    NEED PYARROW MODULE INSTALLED FOR PARQUET AND FEATHER
+    """
+    fmt = output_format(path, fmt)
+    path = output_path(path, fmt)
+
+    if fmt == 'xlsx':
+        write_xlsx(df, path)
+
+    elif fmt == 'parquet':
+        flat_table(df).to_parquet(path, index=False)
+
+    elif fmt == 'feather':
+        flat_table(df).to_feather(path)
+
+    elif fmt == 'csv':
+        df.to_csv(path)
+
+    elif fmt == 'csv.gz':
+        df.to_csv(path, compression='gzip')
+
+    return path
+
+
+def append_table(df, path, fmt=None, new=False):
+    """
+    Adds the rows of df to a table saved by write_table, e.g.
+    the new days of a record updated incrementally. CSV files
+    are appended in place, Parquet and Feather are read and
+    written again.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Same columns of the table saved
+    path : str
+    fmt : str
+        'parquet', 'feather', 'csv' or 'csv.gz'
+    new : bool
+        Writes df as a new table, replacing the saved one
+
+    Returns
+    -------
+    path written
+
+    Requirements
+    ------------
+    NEED PYARROW MODULE INSTALLED FOR PARQUET AND FEATHER
+    """
+    fmt = output_format(path, fmt)
+    path = output_path(path, fmt)
+
+    if new or not os.path.exists(path):
+        return write_table(df, path, fmt)
+
+    if fmt == 'xlsx':
+        raise ValueError("xlsx tables can't be appended, use another format")
+
+    if fmt in ['csv', 'csv.gz']:
+        opener = gzip.open if fmt == 'csv.gz' else open
+
+        # A gzip file may have many members, read as one
+        with opener(path, 'at') as f:
+            df.to_csv(f, header=False, date_format='%Y-%m-%d %H:%M:%S')
+
+    elif fmt == 'parquet':
+        pd.concat([pd.read_parquet(path), flat_table(df)], ignore_index=True).to_parquet(path, index=False)
+
+    elif fmt == 'feather':
+        pd.concat([pd.read_feather(path), flat_table(df)], ignore_index=True).to_feather(path)
+
+    return path
+
+
+def write_chunks(chunks, path, fmt=None):
+    """
+    Saves DataFrames with the same columns, given one after
+    the other, as one table without joining them in memory,
+    in the format selected for the run (see write_table).
+
+    Parameters
+    ----------
+    chunks : iterable
+        DataFrames, e.g. from reduced_chunks
+    path : str
+    fmt : str
+        'xlsx', 'parquet', 'feather', 'csv' or 'csv.gz'
+
+    Requirements
+    ------------
+    NEED PYARROW MODULE INSTALLED FOR PARQUET AND FEATHER
+    """
+    fmt = output_format(path, fmt)
+    path = output_path(path, fmt)
+
+    if fmt == 'xlsx':
+        write_xlsx_chunks(chunks, path)
+
+    elif fmt in ['csv', 'csv.gz']:
+        opener = gzip.open if fmt == 'csv.gz' else open
+
+        with opener(path, 'wt') as f:
+            # Fixed date format, so chunks whose times are all
+            # midnight aren't written as dates only
+            for i, df in enumerate(chunks):
+                df.to_csv(f, header=(i == 0), date_format='%Y-%m-%d %H:%M:%S')
+
+    elif fmt in ['parquet', 'feather']:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+
+        for df in chunks:
+            table = pa.Table.from_pandas(flat_table(df), preserve_index=False)
+
+            if writer is None:
+                schema = table.schema
+
+                # Feather v2 is the Arrow IPC file format
+                if fmt == 'parquet':
+                    writer = pq.ParquetWriter(path, schema)
+                else:
+                    writer = pa.ipc.new_file(path, schema)
+
+            # A chunk that is all NaN may come with other types
+            writer.write_table(table.cast(schema))
+
+        if writer is not None:
+            writer.close()
+
+    return path
+
+
+def reduced_chunks(ds, reduce, columns, time='time', chunk=CHUNK):
+    """
+    Yields the reduction of a Dataset chunk by chunk along
+    time as DataFrames, built straight from the reduced
+    arrays of each variable.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Lazy (opened, not loaded) Dataset, so only the chunk
+        being reduced is read
+    reduce : function
+        Takes a Dataset chunk and returns it with time as the
+        only dimension, e.g. a box spatial mean
+    columns : dict
+        Variables to export and their column names, from
+        metadata_columns, computed once for all chunks
+    chunk : int
+        Time steps per chunk
+    """
+    for start in range(0, ds.sizes[time], chunk):
+        part = reduce(ds.isel({time: slice(start, start + chunk)}))
+
+        yield pd.DataFrame(
+            dict((columns[var], np.asarray(part[var].values)) for var in columns if var in part.data_vars),
+            index=pd.Index(part[time].values, name=time))
+
+
+def export_reduced(ds, path, reduce, columns, fmt=None, time='time', chunk=CHUNK):
+    """
+    Reduces a Dataset and saves it streaming chunk by chunk,
+    so long multi-variable series never become one frame in
+    memory. See reduced_chunks and write_chunks.
+
+    Returns
+    -------
+    path written
+    """
+    return write_chunks(reduced_chunks(ds, reduce, columns, time, chunk), path, fmt)
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Small runner of processing steps declared with
+#            their inputs, that caches each step output by
+#            content hash and reruns only invalidated steps
+
+import os
+import pickle
+import hashlib
+import inspect
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import cache
+
+from profiling import stage
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+# A step is keyed by the code of its function, its
+# parameters, the content of the files it reads and the
+# content hash of the outputs of its input steps. So a
+# step that reruns but returns the same thing doesn't
+# invalidate the steps after it
+
+def step(name, func, inputs=(), files=(), outputs=(), depends=(), cache=True, **params):
+    """
+    Declares a step of a pipeline.
+
+    Parameters
+    ----------
+    name : str
+        Unique name of the step, e.g. 'shetland_mean'
+    func : function
+        Called as func(*[outputs of inputs], **params)
+    inputs : tuple
+        Names of the steps whose outputs are passed to func
+    files : tuple
+        Paths read by func. Their content is part of the key
+    outputs : tuple
+        Paths written by func. The step reruns if one of
+        them is missing
+    depends : tuple
+        Other functions called by func, e.g. the figure
+        functions of a render step, whose code is part of
+        the key
+    cache : bool
+        False for steps that are cheap or return objects that
+        can't be pickled, like opened datasets. They always
+        run and their key stands for their content hash
+    params :
+        Keyword arguments of func
+
+    Returns
+    -------
+    dict
+    """
+    return {
+        'name': name,
+        'func': func,
+        'inputs': tuple(inputs),
+        'files': tuple(files),
+        'outputs': tuple(outputs),
+        'depends': tuple(depends),
+        'cache': cache,
+        'params': params,
+    }
+
+
+def function_key(func):
+    """
+    Returns the source code of func, or its bytecode when
+    the source isn't available
+    """
+    try:
+        return inspect.getsource(func)
+    except (IOError, OSError, TypeError):
+        return func.__code__.co_code.hex()
+
+
+def file_digest(path, cachedir=None, blocksize=2**20):
+    """
+    Returns the sha1 hex digest of a file content. Digests are
+    kept by path, size and modification time, so unchanged
+    files are read only once
+    """
+    info = os.stat(path)
+
+    memo = cache.cache_path(
+        'files',
+        cache.cache_key(os.path.abspath(path), info.st_size, info.st_mtime_ns),
+        cachedir=cachedir)
+
+    digest = cache.load(memo)
+
+    if digest is None:
+        sha1 = hashlib.sha1()
+
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(blocksize), b''):
+                sha1.update(block)
+
+        digest = sha1.hexdigest()
+
+        cache.store(memo, digest)
+
+    return digest
+
+
+def _execute(task, values, digests, cachedir):
+    """
+    Runs one step or loads its output from the cache.
+    Returns (output, content hash, status)
+    """
+    key = cache.cache_key(
+        function_key(task['func']),
+        [function_key(func) for func in task['depends']],
+        task['params'],
+        digests,
+        [file_digest(path, cachedir) for path in task['files']])
+
+    if not task['cache']:
+        with stage(task['name']):
+            return task['func'](*values, **task['params']), key, 'run'
+
+    path = cache.cache_path('pipeline', key, cachedir=cachedir)
+
+    entry = cache.load(path)
+
+    if entry is not None and all(os.path.exists(output) for output in task['outputs']):
+        return entry['value'], entry['digest'], 'cached'
+
+    with stage(task['name']):
+        value = task['func'](*values, **task['params'])
+
+    digest = hashlib.sha1(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+    cache.store(path, {'value': value, 'digest': digest})
+
+    return value, digest, 'run'
+
+
+def run(steps, workers=None, cachedir=None, verbose=True):
+    """
+    Runs a list of steps. Each step starts as soon as its
+    inputs are ready, so independent steps run concurrently
+    in a pool of threads (NetCDF reading and numpy release
+    the GIL; render steps use their own processes).
+
+    Parameters
+    ----------
+    steps : list
+        Steps built by step(), in any order
+    workers : int
+        Number of threads, default is the executor's one
+    verbose : bool
+        Prints whether each step ran or was cached
+
+    Returns
+    -------
+    dict with the output of each step by name
+    """
+    tasks = dict((task['name'], task) for task in steps)
+
+    for task in steps:
+        for name in task['inputs']:
+            if name not in tasks:
+                raise ValueError('Step {} needs an unknown step: {}'.format(task['name'], name))
+
+    results = {}
+    digests = {}
+
+    pending = [task['name'] for task in steps]
+    running = {}
+
+    with ThreadPoolExecutor(workers) as pool:
+        while pending or running:
+            for name in list(pending):
+                task = tasks[name]
+
+                if all(i in digests for i in task['inputs']):
+                    pending.remove(name)
+
+                    future = pool.submit(
+                        _execute,
+                        task,
+                        [results[i] for i in task['inputs']],
+                        [digests[i] for i in task['inputs']],
+                        cachedir)
+
+                    running[future] = name
+
+            if not running:
+                raise ValueError('Steps with circular inputs: {}'.format(', '.join(pending)))
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                name = running.pop(future)
+
+                results[name], digests[name], status = future.result()
+
+                if verbose:
+                    print('{:<8} {}'.format(status, name))
+
+    return results
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Principal axes of the wind (major axis angle,
+#            variance fractions and variance ellipse) of all
+#            stations, calendar months and seasons at once,
+#            giving the axes_rotation of wind.pol2cart_wind
+
+import calendar
+
+import numpy as np
+import pandas as pd
+
+from seasons import SEASONS, season_year
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# Groups of time steps of each station: all together, each
+# calendar month and each austral season
+GROUPS = (['ALL'] +
+          [calendar.month_abbr[m].upper() for m in range(1, 13)] +
+          list(SEASONS))
+
+# Columns of the table returned by principal_axes()
+COLUMNS = [
+    'station', 'group', 'n', 'u_mean', 'v_mean', 'u_var', 'v_var', 'uv_cov',
+    'angle', 'direction', 'major_fraction', 'minor_fraction',
+    'major', 'minor', 'eccentricity', 'axes_rotation']
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def group_masks(index):
+    """
+    (len(GROUPS), time) boolean array, the first row selects
+    all time steps, the next 12 each calendar month and the
+    last 4 each season
+    """
+    index = pd.DatetimeIndex(index)
+
+    months = np.asarray(index.month)
+    season = season_year(index)[1]
+
+    return np.vstack([np.ones(months.shape, dtype=bool)] +
+                     [months == m for m in range(1, 13)] +
+                     [season == s for s in range(len(SEASONS))])
+
+
+def _components(df, u, v):
+    """
+    (station, time) arrays of u and v from a DataFrame with
+    (station, variable) columns, NaN where any of them is
+    missing
+    """
+    stations = df.columns.get_level_values(0).unique()
+
+    U = df.reindex(columns=pd.MultiIndex.from_product([stations, [u]])).values.T.astype(float)
+    V = df.reindex(columns=pd.MultiIndex.from_product([stations, [v]])).values.T.astype(float)
+
+    missing = np.isnan(U) | np.isnan(V)
+    U[missing] = np.nan
+    V[missing] = np.nan
+
+    return stations, U, V
+
+
+def principal_axes(df, u='u', v='v', min_count=3):
+    """
+    Principal component analysis of the wind components of
+    every station in every group of GROUPS, from one
+    covariance computation over (station, group, time).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DatetimeIndex or PeriodIndex and (station, variable)
+        columns, e.g. store.query(sources=['reader'], variables=['u', 'v'], wide=True)
+    u, v : str
+        Variable names of the zonal and meridional components
+    min_count : int
+        Time steps with both components needed for a result,
+        else NaN
+
+    Returns
+    -------
+    pd.DataFrame with COLUMNS, where
+        angle : major axis, degrees anticlockwise from east,
+            between -90 and 90
+        direction : major axis as a meteorological direction,
+            between 0 and 180
+        major_fraction, minor_fraction : variance explained by
+            each axis
+        major, minor : semi-axes of the standard deviation
+            ellipse (square root of the eigenvalues)
+        axes_rotation : angle to give pol2cart_wind so that u
+            is along the major axis and v along the minor one
+    """
+    index = df.index.to_timestamp() if isinstance(df.index, pd.PeriodIndex) else df.index
+
+    stations, U, V = _components(df, u, v)
+
+    valid = ~np.isnan(U)
+    U = np.where(valid, U, 0.)
+    V = np.where(valid, V, 0.)
+
+    # (station, group, time) weights
+    weights = group_masks(index)[None, :, :] & valid[:, None, :]
+
+    n = weights.sum(axis=-1).astype(float)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        u_mean = np.einsum('sgt,st->sg', weights, U) / n
+        v_mean = np.einsum('sgt,st->sg', weights, V) / n
+
+        # Sample (co)variances from the raw moments
+        ddof = n / (n - 1)
+
+        u_var = (np.einsum('sgt,st,st->sg', weights, U, U) / n - u_mean ** 2) * ddof
+        v_var = (np.einsum('sgt,st,st->sg', weights, V, V) / n - v_mean ** 2) * ddof
+        uv_cov = (np.einsum('sgt,st,st->sg', weights, U, V) / n - u_mean * v_mean) * ddof
+
+    u_var = np.maximum(u_var, 0.)
+    v_var = np.maximum(v_var, 0.)
+
+    # Eigenvalues and eigenvector angle of the 2 x 2
+    # covariance matrices in closed form
+    half_sum = (u_var + v_var) / 2.
+    radius = np.hypot((u_var - v_var) / 2., uv_cov)
+
+    major_var = half_sum + radius
+    minor_var = np.maximum(half_sum - radius, 0.)
+
+    angle = np.degrees(np.arctan2(2. * uv_cov, u_var - v_var) / 2.)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        major_fraction = major_var / (major_var + minor_var)
+        eccentricity = np.sqrt(1. - minor_var / major_var)
+
+    table = {
+        'n': n,
+        'u_mean': u_mean,
+        'v_mean': v_mean,
+        'u_var': u_var,
+        'v_var': v_var,
+        'uv_cov': uv_cov,
+        'angle': angle,
+        'direction': (90. - angle) % 180.,
+        'major_fraction': major_fraction,
+        'minor_fraction': 1. - major_fraction,
+        'major': np.sqrt(major_var),
+        'minor': np.sqrt(minor_var),
+        'eccentricity': eccentricity,
+        # Axes rotated anticlockwise by angle, which is a
+        # negative (anticlockwise) axes_rotation
+        'axes_rotation': -angle,
+    }
+
+    few = n < min_count
+
+    result = pd.DataFrame(dict(
+        (name, np.where(few, np.nan, values).ravel()) if name != 'n' else (name, values.ravel())
+        for name, values in table.items()))
+
+    result.insert(0, 'group', np.tile(GROUPS, len(stations)))
+    result.insert(0, 'station', np.repeat(np.asarray(stations), len(GROUPS)))
+    result['n'] = result['n'].astype(int)
+
+    return result[COLUMNS]
+
+
+def axes_rotation(axes, index, by='month'):
+    """
+    Rotation of each station at each time step from a
+    principal_axes() table, to broadcast with speed and
+    direction in pol2cart_wind:
+
+        rotation = axes_rotation(axes, wspd.index)
+        u, v = pol2cart_wind(wspd, wdir, axes_rotation=rotation[wspd.columns])
+
+    Parameters
+    ----------
+    axes : pd.DataFrame
+        principal_axes() result
+    index : DatetimeIndex or PeriodIndex
+        Time steps of the series to rotate
+    by : str
+        'all', 'month' or 'season', the group whose axes are
+        used at each time step
+
+    Returns
+    -------
+    pd.DataFrame with index on rows and stations on columns
+    """
+    if isinstance(index, pd.PeriodIndex):
+        time = index.to_timestamp()
+    else:
+        time = pd.DatetimeIndex(index)
+
+    if by == 'all':
+        groups = np.repeat('ALL', len(time))
+    elif by == 'month':
+        groups = np.array(GROUPS[1:13])[np.asarray(time.month) - 1]
+    elif by == 'season':
+        groups = SEASONS[season_year(time)[1]]
+    else:
+        raise ValueError("by must be 'all', 'month' or 'season', not {}".format(by))
+
+    rotation = axes.pivot(index='group', columns='station', values='axes_rotation')
+
+    result = rotation.reindex(groups)
+    result.index = index
+    result.columns.name = None
+
+    return result
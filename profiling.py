@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Wall time, CPU time, peak memory and bytes read
+#            and written of each named stage of a script,
+#            saved as a JSON report per run
+
+import os
+import sys
+import json
+import time
+import atexit
+import resource
+import functools
+import threading
+import contextlib
+
+from datetime import datetime
+
+import cache
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# ANNABIA_PROFILE=1 records the stages, otherwise stage()
+# and profiled() do nothing
+PROFILE = os.environ.get('ANNABIA_PROFILE', '0') == '1'
+
+PROFILEDIR = os.environ.get(
+    'ANNABIA_PROFILEDIR',
+    os.path.join(cache.CACHEDIR, 'profiles'))
+
+# Stages recorded in this run, in the order they finished
+STAGES = []
+
+_lock = threading.Lock()
+_local = threading.local()
+
+# Stages running in each thread and number of stages that
+# started while another thread had one running. The peak
+# RSS is reset only when no other thread is inside a stage
+_running = {}
+_overlaps = [0]
+_start = (datetime.now(), time.perf_counter(), time.process_time())
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+# Memory and I/O come from /proc on Linux. Elsewhere the
+# peak is the one of the whole process and bytes are None
+
+def _proc_status(field):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except (IOError, OSError):
+        pass
+
+    return None
+
+
+def _reset_peak():
+    """
+    Resets the peak RSS of the process (Linux >= 4.0), so the
+    peak read at the end of a stage is the one of the stage
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except (IOError, OSError):
+        pass
+
+
+def peak_rss():
+    """
+    Returns the peak resident memory in bytes
+    """
+    peak = _proc_status('VmHWM')
+
+    if peak is None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # Linux gives kilobytes and macOS bytes
+        if sys.platform != 'darwin':
+            peak = peak * 1024
+
+    return peak
+
+
+def io_counters():
+    """
+    Returns (bytes read, bytes written) by the process,
+    including the ones served by the page cache, or
+    (None, None) when it isn't available
+    """
+    counters = {}
+
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                key, value = line.split(':')
+                counters[key] = int(value)
+    except (IOError, OSError, ValueError):
+        return None, None
+
+    return counters.get('rchar'), counters.get('wchar')
+
+
+def _delta(end, begin):
+    if end is None or begin is None:
+        return None
+
+    return end - begin
+
+
+@contextlib.contextmanager
+def stage(name):
+    """
+    Records a named stage of a script:
+
+        with stage('read_excel'):
+            df = pd.read_excel(...)
+
+    Nested stages are named 'outer/inner'. CPU time and
+    bytes are the ones of the whole process, so stages
+    running concurrently in threads count each other's.
+    The peak memory of a stage that overlapped a stage of
+    another thread is the one of the process since it
+    started, marked with peak_scope 'process' instead of
+    'stage', because resetting it would clobber the peak of
+    the other stage
+    """
+    if not PROFILE:
+        yield
+        return
+
+    parents = getattr(_local, 'parents', [])
+    _local.parents = parents + [name]
+
+    thread = threading.get_ident()
+
+    with _lock:
+        overlapped = any(count for ident, count in _running.items() if ident != thread)
+
+        if overlapped:
+            _overlaps[0] += 1
+        else:
+            _reset_peak()
+
+        _running[thread] = _running.get(thread, 0) + 1
+        overlaps = _overlaps[0]
+
+    first = len(STAGES)
+    read, written = io_counters()
+    wall, cpu = time.perf_counter(), time.process_time()
+
+    try:
+        yield
+    finally:
+        end_read, end_written = io_counters()
+
+        with _lock:
+            _running[thread] -= 1
+            overlapped = overlapped or _overlaps[0] != overlaps
+
+        path = '/'.join(_local.parents)
+
+        # Inner stages reset the peak, so theirs count too
+        inner = [r['peak_rss'] for r in STAGES[first:] if r['stage'].startswith(path + '/')]
+
+        record = {
+            'stage': path,
+            'wall': time.perf_counter() - wall,
+            'cpu': time.process_time() - cpu,
+            'peak_rss': max([peak_rss()] + inner),
+            'peak_scope': 'process' if overlapped else 'stage',
+            'read_bytes': _delta(end_read, read),
+            'written_bytes': _delta(end_written, written),
+        }
+
+        _local.parents = parents
+
+        with _lock:
+            STAGES.append(record)
+
+
+def profiled(name=None):
+    """
+    Decorator that records each call of a function as a
+    stage, named as the function by default
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name or func.__name__):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def report(path=None):
+    """
+    Writes the JSON report of this run and prints a summary.
+
+    The default path is PROFILEDIR/<script>-<start time>.json
+
+    Returns
+    -------
+    path of the report
+    """
+    script = os.path.splitext(os.path.basename(sys.argv[0] or 'interactive'))[0]
+    started, wall, cpu = _start
+
+    if path is None:
+        path = os.path.join(
+            PROFILEDIR,
+            '{}-{}.json'.format(script, started.strftime('%Y%m%d-%H%M%S')))
+
+    read, written = io_counters()
+
+    run = {
+        'script': script,
+        'start': started.isoformat(),
+        'wall': time.perf_counter() - wall,
+        'cpu': time.process_time() - cpu,
+        'peak_rss': max([peak_rss()] + [record['peak_rss'] for record in STAGES]),
+        'read_bytes': read,
+        'written_bytes': written,
+        'stages': STAGES,
+    }
+
+    folder = os.path.dirname(path)
+
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    with open(path, 'w') as f:
+        json.dump(run, f, indent=2)
+
+    print('{:<40} {:>9} {:>9} {:>10} {:>10} {:>10}'.format(
+        'stage', 'wall (s)', 'cpu (s)', 'peak (MB)', 'read (MB)', 'write (MB)'))
+
+    for record in STAGES + [dict(run, stage='total')]:
+        print('{:<40} {:>9.2f} {:>9.2f} {:>10} {:>10} {:>10}'.format(
+            record['stage'],
+            record['wall'],
+            record['cpu'],
+            _megabytes(record['peak_rss']),
+            _megabytes(record['read_bytes']),
+            _megabytes(record['written_bytes'])))
+
+    print('Profile saved in {}'.format(path))
+
+    return path
+
+
+def _megabytes(value):
+    if value is None:
+        return '-'
+
+    return '{:.1f}'.format(value / 2.**20)
+
+
+# Every script that imports this module leaves its report
+if PROFILE:
+    atexit.register(report)
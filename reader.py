@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Reading MetReader (READER) monthly tables of
+#            all stations and variables at once
+
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from dtypes import VALUE_DTYPE
+from stations import METADICT
+
+################################################
+#### Config Parameters and Global Variables ####
+################################################
+
+ROOTDIR = (
+    'https://legacy.bas.ac.uk/met/READER/' +
+    'surface'
+)
+
+VARDICT = {
+    'wspd': 'wind_speed.txt',
+    'wdir': 'wind_direction.txt',
+}
+
+################################################
+#### Functions #################################
+################################################
+
+def reader_name(key):
+    """
+    Returns the name used by READER in its file names
+    for a station of METADICT (e.g. "O'Higgins" ->
+    'O_Higgins')
+    """
+    name = METADICT[key]['name']
+
+    return name.replace(' ', '_').replace("'", '_')
+
+
+def monthly_index(years):
+    """
+    Builds the datetime64 monthly index of a year x 12
+    grid flattened in row order (year by year, from
+    January to December)
+    """
+    years = np.asarray(years, dtype='int64')
+
+    # Months since 1970-01 is how numpy stores
+    # datetime64[M] values
+    months = (years[:, None] - 1970) * 12 + np.arange(12)
+
+    return months.ravel().astype('datetime64[M]')
+
+
+def read_reader_table(path):
+    """
+    Reads a READER text file, where each row has a year
+    followed by its 12 monthly values, and reshapes the
+    grid directly into a monthly series.
+
+    Parameters
+    ----------
+    path : str
+        Local path or URL of the READER file
+
+    Returns
+    -------
+    time : np.ndarray
+        datetime64[M] monthly time axis
+    values : np.ndarray
+        float values, NaN where READER has '-'
+    """
+    data = pd.read_csv(
+        path,
+        skiprows=1,
+        sep='\\s+',
+        header=None,
+        names=['year'] + list(range(1, 13)),
+        index_col=False,
+        na_values='-')
+
+    time = monthly_index(data['year'].values)
+    values = data.iloc[:, 1:].to_numpy(dtype=float).ravel()
+
+    return time, values
+
+
+def read_station(station, vardict=VARDICT, rootdir=ROOTDIR):
+    """
+    Returns a DataFrame with one column per variable of
+    vardict for a READER station name (e.g. 'Deception')
+    """
+    archive = load_reader_archive(
+        stations=[station],
+        vardict=vardict,
+        rootdir=rootdir,
+        names=[station])
+
+    df = archive.isel(station=0).to_pandas().T
+    df.columns.name = None
+    df.index = pd.DatetimeIndex(df.index, name=None)
+
+    return df
+
+
+def load_reader_archive(stations=None, vardict=VARDICT, rootdir=ROOTDIR, names=None):
+    """
+    Reads all variables of all stations into one
+    station x variable x time array.
+
+    Each file is read once and its values are copied
+    into an array preallocated over the time span
+    covered by all files. Missing files (a variable
+    not measured at a station) stay as NaN.
+
+    Parameters
+    ----------
+    stations : list
+        METADICT keys, default is all of them
+    vardict : dict
+        Variable names and the READER file suffix
+    rootdir : str
+        Local folder or URL with READER files
+    names : list
+        READER station names, default is given by
+        reader_name
+
+    Returns
+    -------
+    xr.DataArray with dimensions (station, variable, time)
+    """
+    if stations is None:
+        stations = list(METADICT.keys())
+
+    if names is None:
+        names = [reader_name(key) for key in stations]
+
+    variables = list(vardict.keys())
+
+    tables = {}
+
+    for i, name in enumerate(names):
+        for j, var in enumerate(variables):
+            fname = name + '.All.' + vardict[var]
+
+            try:
+                tables[i, j] = read_reader_table(
+                    os.path.join(rootdir, fname))
+            except (IOError, OSError):
+                continue
+
+    if tables:
+        first = min(time[0] for time, _ in tables.values())
+        last = max(time[-1] for time, _ in tables.values())
+    else:
+        first = last = np.datetime64('1970-01', 'M')
+
+    time = np.arange(first, last + 1)
+
+    data = np.full(
+        (len(stations), len(variables), len(time)),
+        np.nan,
+        dtype=VALUE_DTYPE)
+
+    # Position of each value in the common time axis,
+    # which also handles years missing from a file
+    for (i, j), (t, values) in tables.items():
+        data[i, j, (t - first).astype(int)] = values
+
+    return xr.DataArray(
+        data,
+        dims=('station', 'variable', 'time'),
+        coords={
+            'station': list(stations),
+            'variable': variables,
+            'time': time.astype('datetime64[ns]'),
+        },
+        name='reader')
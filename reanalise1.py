@@ -16,6 +16,12 @@ import numpy as np
 import pandas as pd
 import xarray as xr
 
+from dtypes import compact, memory_report
+from output import write_table
+from profiling import stage
+from reanalysis import open_reanalysis
+from stations import station_cells
+
 ##################################################################################################################################
 #### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
 ##################################################################################################################################
@@ -76,7 +82,7 @@ def pol2cart_wind(wspd, wdir, axes_rotation = 0, magnetic_declination = 0):
     import math
 
     # Step 1
-    wdir = math.ceil(wdir) # always rounds the float number to next integer, but returns a float number
+    wdir = np.ceil(wdir) # always rounds the float number to next integer, but returns a float number
     wspd = round(wspd, 1)  # round a number to a given precision in decimal digits considering round laws
 
     # Step 2
@@ -165,7 +171,7 @@ def cart2pol_wind(u, v, axes_rotation = 0, magnetic_declination = 0):
         wdir = wdir + 360.
 
     # Step 5
-    wdir = math.ceil(wdir) # always rounds the float number to next integer, but returns a float number
+    wdir = np.ceil(wdir) # always rounds the float number to next integer, but returns a float number
     wspd = round(wspd, 1) # round a number to a given precision in decimal digits considering round laws
 
     return(wspd, wdir)
@@ -176,18 +182,35 @@ def cart2pol_wind(u, v, axes_rotation = 0, magnetic_declination = 0):
 #### IMPORTING AND MANIPULATING ALL TIME SERIES ##################################################################################
 ##################################################################################################################################
 
-ncep = xr.open_dataset(os.path.join(DATADIR, 'reanalise1.nc'))
+with stage('open'):
+    ncep = open_reanalysis(os.path.join(DATADIR, 'reanalise1.nc'))
+
+    ncep = ncep.assign_coords(longitude = ncep.longitude - 360.)
+
+with stage('annual'):
+    ncep = ncep.resample(time = 'YE').mean()
+
+    # Grid point of the 'reanalise' site of the maps
+    cells = station_cells(ncep.latitude.values, ncep.longitude.values, stations = ['reanalise'])
+
+    i, j = cells['i']['reanalise'], cells['j']['reanalise']
+
+    u = ncep.uwnd[ :, i, j].values
+    v = ncep.vwnd[ :, i, j].values
 
-ncep.longitude.data = ncep.longitude.data - 360.
+with stage('wind'):
+    wspd, wdir = [np.nan] * len(ncep.time), [np.nan] * len(ncep.time)
 
-ncep = ncep.resample('A', 'time', how = 'mean')
+    for i in range(len(ncep.time)):
+        wspd[i], wdir[i] = cart2pol_wind(u[i], v[i])
 
-wspd, wdir = [np.nan] * len(ncep.time), [np.nan] * len(ncep.time)
+    df = pd.DataFrame (index = ncep.time.data, columns = ['u', 'v', 'spd'],
+                       data = {'u': u, 'v': v, 'spd': wspd} )
 
-for i in xrange(len(ncep.time)):
-    wspd[i], wdir[i] = cart2pol_wind(ncep.uwnd[ :, 1, 1].data[i], ncep.vwnd[ :, 1, 1].data[i])
+    # float32 columns, see dtypes.py
+    df, df_loaded = compact(df), df
 
-df = pd.DataFrame (index = ncep.time.data, columns = ['u', 'v', 'spd'],
-                   data = {'u': ncep.uwnd[ :, 1, 1].data, 'v': ncep.vwnd[ :, 1, 1].data, 'spd': wspd} )
+    print(memory_report({'reanalise1': (df_loaded, df)}))
 
-df.to_excel(os.path.join(ROOTDIR, 'reanalise', 'reanalise1.xlsx'))
\ No newline at end of file
+with stage('write'):
+    write_table(df, os.path.join(ROOTDIR, 'reanalise', 'reanalise1.xlsx'))
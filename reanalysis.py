@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Opening the reanalyses' netCDF files the same
+#            way in every script, one file or many joined
+#            along time
+
+import xarray as xr
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def open_reanalysis(files, **kwargs):
+    """
+    Opens reanalysis files lazily.
+
+    Parameters
+    ----------
+    files : str or list
+        One netCDF file, or many combined by their
+        coordinates, e.g. one file per variable or per year
+    kwargs :
+        Passed to xr.open_dataset or xr.open_mfdataset, e.g.
+        chunks
+
+    Returns
+    -------
+    xr.Dataset
+
+    Requirements
+    ------------
+    NEED DASK MODULE INSTALLED to open many files
+    """
+    if isinstance(files, (list, tuple)):
+        if len(files) == 1:
+            return xr.open_dataset(files[0], **kwargs)
+
+        return xr.open_mfdataset(list(files), combine='by_coords', **kwargs)
+
+    return xr.open_dataset(files, **kwargs)
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Rendering the stations' and regions' figures
+#            in parallel worker processes without display
+
+import os
+import multiprocessing
+
+import numpy as np
+import matplotlib as mpl
+
+from concurrent.futures import ProcessPoolExecutor
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# ANNABIA_BATCH=1 makes the scripts save their
+# figures with render_figures instead of showing them
+BATCH = os.environ.get('ANNABIA_BATCH', '0') == '1'
+
+MESES = ['JAN', 'FEV', 'MAR', 'ABR', 'MAI', 'JUN', 'JUL', 'AGO', 'SET', 'OUT', 'NOV', 'DEZ']
+
+##################################################################################################################################
+#### FIGURES #####################################################################################################################
+##################################################################################################################################
+# Each function draws one figure and returns it, so
+# it can run both in a worker and interactively
+
+def station_annual_figure(values, years, title):
+    """
+    Yearly zonal wind of a station, with years on the y-axis
+    and the wind on the x-axis plus its tendency line
+    """
+    import matplotlib.pyplot as plt
+    from scipy import stats
+
+    fig, ax = plt.subplots(figsize=(5, 7))
+
+    # This plot wasn't do normally (u_year.plot()), because we want to put the years (Serie's index) in the y-axis and the u data
+    # (Serie's values) in x-axis.
+    ax.plot(values, years, color='k')
+
+    ax.set_title(title, y=1.07, fontweight='bold')
+
+    ax.set_xlabel('Componente Zonal do Vento ($\\mathregular{m.s^{-1}}$)')
+    ax.set_ylabel('Anos')
+
+    ax.xaxis.set_label_position('top') # Putting the x-axis label in top border
+    ax.xaxis.set_ticks_position('top') # Putting the x-axis ticks in top border
+
+    ax.axvline(0, linestyle='--', color='gray', linewidth=1) # Plotting a vertical line in position 0 of x-axis
+
+    valid = ~np.isnan(values)
+
+    if valid.sum() > 2:
+        slope, intercept = stats.linregress(
+            np.asarray(values)[valid],
+            np.asarray(years)[valid])[:2]
+
+        ax.plot(intercept + slope * np.asarray(values), years, color='red', linewidth=0.4)
+
+    return fig
+
+
+def station_monthly_figure(values, title):
+    """
+    Monthly climatology of the zonal wind of a station
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(5, 3))
+
+    ax.plot(np.arange(12), values, color='k')
+
+    ax.set_title(title, y=1.02, fontweight='bold')
+
+    ax.set_ylabel('Componente Zonal do Vento ($\\mathregular{m.s^{-1}}$)')
+    ax.set_xlabel('Meses')
+
+    ax.axhline(0, linestyle='--', color='gray', linewidth=1) # Plotting a horizontal line in position 0 of y-axis
+
+    ax.set_xticks(np.arange(12))
+    ax.set_xticklabels((MESES), rotation=False)
+
+    return fig
+
+
+def region_map_figure(lon, lat, field, extent, resolution='f', method='mesh', points=True):
+    """
+    Map of a gridded field over a region, with one parallel
+    and meridian per grid line.
+
+    Parameters
+    ----------
+    lon, lat : np.ndarray
+        1D grid coordinates
+    field : np.ndarray
+        2D (lat, lon) values
+    extent : tuple
+        (llcrnrlat, urcrnrlat, llcrnrlon, urcrnrlon)
+    resolution : str
+        'c'=crude, 'l'=low, 'i'=intermediate, 'h'=high and 'f'=full
+    method : str
+        'mesh' or 'image', see mapping.draw_field
+    points : bool
+        Marks each grid point over the field
+    """
+    import matplotlib.pyplot as plt
+    from mapping import cached_basemap, draw_field
+
+    fig, ax = plt.subplots()
+
+    m = cached_basemap(projection='merc',
+                       llcrnrlat=extent[0], urcrnrlat=extent[1],
+                       llcrnrlon=extent[2], urcrnrlon=extent[3],
+                       resolution=resolution, area_thresh=0, ax=ax)
+
+    m.drawcoastlines(linewidth=0.5)
+    m.drawmapboundary()
+
+    m.fillcontinents(color='gray', zorder=1)
+
+    m.drawparallels(lat, labels=[True, True, False, False], color='k',
+                    linewidth=0.5, fontweight='bold', fontsize=10, zorder=999)
+    m.drawmeridians(lon, labels=[False, False, True, True], color='k',
+                    linewidth=0.5, fontweight='bold', fontsize=10, zorder=999, rotation=45)
+
+    mappable = draw_field(m, lon, lat, field, method=method, points=points, zorder=2)
+
+    fig.colorbar(mappable, ax=ax)
+
+    return fig
+
+
+def quicklook_figure(lon, lat, field, title=None, extent=None):
+    """
+    Fast, small map of a field over the whole Antarctic
+    Peninsula domain to check the data, drawn as an image
+    over low resolution coastlines and without grid points.
+    It takes about a second, against minutes of the full
+    resolution maps.
+
+    Parameters
+    ----------
+    lon, lat : np.ndarray
+        1D grid coordinates
+    field : np.ndarray
+        2D (lat, lon) values
+    title : str
+    extent : tuple
+        (llcrnrlat, urcrnrlat, llcrnrlon, urcrnrlon), default
+        is mapping.PENINSULA
+    """
+    import matplotlib.pyplot as plt
+    from mapping import PENINSULA, cached_basemap, draw_field
+
+    if extent is None:
+        extent = PENINSULA
+
+    lon = np.asarray(lon)
+    lat = np.asarray(lat)
+
+    # Only the grid inside the domain is drawn
+    ilon = (lon >= extent[2]) & (lon <= extent[3])
+    ilat = (lat >= extent[0]) & (lat <= extent[1])
+
+    fig, ax = plt.subplots(figsize=(4, 4), dpi=72)
+
+    m = cached_basemap(projection='merc',
+                       llcrnrlat=extent[0], urcrnrlat=extent[1],
+                       llcrnrlon=extent[2], urcrnrlon=extent[3],
+                       resolution='l', ax=ax)
+
+    mappable = draw_field(m, lon[ilon], lat[ilat], np.asarray(field)[np.ix_(ilat, ilon)],
+                          method='image')
+
+    m.drawcoastlines(linewidth=0.3)
+
+    fig.colorbar(mappable, ax=ax, shrink=0.7)
+
+    if title is not None:
+        ax.set_title(title, fontsize=8)
+
+    return fig
+
+##################################################################################################################################
+#### RENDERING ###################################################################################################################
+##################################################################################################################################
+
+def current_style():
+    """
+    Returns the rcParams changed by the running script, which
+    are shared with the workers
+    """
+    return {
+        key: value
+        for key, value in mpl.rcParams.items()
+        if key != 'backend' and value != mpl.rcParamsDefault[key]}
+
+
+def _init_worker(style):
+    """
+    Sets the Agg backend and the shared style once per worker
+    """
+    mpl.use('Agg', force=True)
+    mpl.rcParams.update(style)
+
+
+def _render(job):
+    """
+    Draws and saves one (function, args, filename) job
+    """
+    import matplotlib.pyplot as plt
+
+    function, args, filename = job
+
+    fig = function(*args)
+    fig.savefig(filename)
+    plt.close(fig)
+
+    return filename
+
+
+def render_figures(jobs, processes=None, style=None):
+    """
+    Draws and saves figures concurrently in a pool of worker
+    processes using the Agg backend.
+
+    Parameters
+    ----------
+    jobs : list
+        (function, args, filename) tuples, where function(*args)
+        returns a matplotlib figure, e.g.
+        (station_monthly_figure, (u_month.values, title), path)
+    processes : int
+        Number of workers, default is the number of cores
+    style : dict
+        rcParams of the figures, default is current_style()
+
+    Returns
+    -------
+    list of filenames saved
+    """
+    if style is None:
+        style = current_style()
+
+    # The scripts don't have a __main__ guard, so workers are
+    # forked where possible instead of spawned, which would
+    # run the calling script again in each of them
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+    with ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(style,)) as pool:
+        return list(pool.map(_render, jobs))
+
+
+def show_figures(jobs):
+    """
+    Draws all jobs in the current process and shows them,
+    the interactive counterpart of render_figures
+    """
+    import matplotlib.pyplot as plt
+
+    for function, args, _ in jobs:
+        function(*args)
+
+    plt.show()
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Southern Annular Mode (SAM) index of Gong and
+#            Wang (1999), the difference of the normalised
+#            zonal mean sea level pressure at 40S and 65S,
+#            from the reanalyses' files with monthly means
+#            reduced chunk by chunk and cached per source
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import cache
+
+from pipeline import file_digest, function_key
+from reanalysis import open_reanalysis
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+ROOTDIR = '/home/douglasnehme/Desktop/bia'
+DATADIR = os.path.join(ROOTDIR, 'arquivos')
+
+# Sea level pressure of each reanalysis: files, variable
+# and coordinate names. The index needs global grids, so
+# these are the monthly means of the whole globe (ERA5 from
+# Copernicus CDS, NCEP/NCAR and 20CRv3 from NOAA PSL), not
+# the regional boxes the other scripts read
+SOURCES = {
+    'era': {
+        'files': [os.path.join(DATADIR, 'era5_msl.mon.mean.nc')],
+        'var': 'msl', 'lat': 'latitude', 'lon': 'longitude'},
+    'reanalise1': {
+        'files': [os.path.join(DATADIR, 'slp.mon.mean.nc')],
+        'var': 'slp', 'lat': 'lat', 'lon': 'lon'},
+    '20thC_ReanV3': {
+        'files': [os.path.join(DATADIR, 'prmsl.mon.mean.nc')],
+        'var': 'prmsl', 'lat': 'lat', 'lon': 'lon'},
+}
+
+# Latitudes of the index, north minus south
+LATITUDES = (-40., -65.)
+
+# Time steps read at a time, one year of hourly fields
+CHUNK = 8760
+
+# Degrees of longitude a grid may miss of the 360 of a
+# zonal mean
+LON_TOLERANCE = 0.01
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def check_global(ds, lon, tolerance=LON_TOLERANCE):
+    """
+    Raises ValueError unless the longitudes of ds go around
+    the globe without gaps, i.e. their span plus their
+    spacing is 360 degrees, since the zonal mean of a
+    regional grid isn't the one of the index
+    """
+    grid = np.unique(np.asarray(ds[lon].values, dtype=float) % 360.)
+
+    # Steps between longitudes, the last one across 0/360
+    steps = np.diff(np.append(grid, grid[0] + 360.))
+
+    spacing = steps.min()
+
+    if len(grid) < 2 or steps.max() > spacing + tolerance:
+        raise ValueError(
+            'The zonal mean needs longitudes around the globe, but they cover {:g} of the 360 '
+            'degrees'.format(360. - steps.max() + spacing if len(grid) > 1 else 0.))
+
+
+def latitude_rows(ds, lat, latitudes=LATITUDES):
+    """
+    Grid latitudes nearest to each of latitudes, which
+    must be inside the grid
+    """
+    grid = ds[lat].values
+
+    rows = [grid[np.abs(grid - target).argmin()] for target in latitudes]
+
+    spacing = np.abs(np.diff(grid)).max() if len(grid) > 1 else 0.
+
+    for target, row in zip(latitudes, rows):
+        if abs(row - target) > spacing:
+            raise ValueError('Latitude {} is outside the grid ({} to {})'.format(
+                target, grid.min(), grid.max()))
+
+    return rows
+
+
+def monthly_zonal_means(ds, var, lat, lon, time='time', latitudes=LATITUDES, chunk=CHUNK):
+    """
+    Monthly means of the zonal mean of var at latitudes,
+    reading only those rows, one chunk of time at a time.
+    Months split between chunks are summed before the mean.
+
+    Returns
+    -------
+    pd.DataFrame with a monthly PeriodIndex and one column
+    per latitude
+    """
+    check_global(ds, lon)
+
+    rows = latitude_rows(ds, lat, latitudes)
+
+    field = ds[var].sel({lat: rows})
+
+    total = None
+    count = None
+
+    for start in range(0, ds.sizes[time], chunk):
+        part = field.isel({time: slice(start, start + chunk)}).mean(dim=lon)
+
+        df = pd.DataFrame(
+            np.asarray(part.transpose(time, lat).values, dtype=float),
+            index=pd.DatetimeIndex(part[time].values).to_period('M'),
+            columns=list(latitudes))
+
+        grouped = df.groupby(level=0)
+
+        total = grouped.sum() if total is None else total.add(grouped.sum(), fill_value=0)
+        count = grouped.count() if count is None else count.add(grouped.count(), fill_value=0)
+
+    result = total / count.where(count > 0)
+    result.index.name = time
+
+    return result
+
+
+def normalise(df, base=None):
+    """
+    Standardises each column by the mean and standard
+    deviation of its calendar month over the base period
+    (first, last year), default is the whole record
+    """
+    reference = df if base is None else df[
+        (df.index.year >= base[0]) & (df.index.year <= base[1])]
+
+    grouped = reference.groupby(reference.index.month)
+
+    mean = grouped.mean().reindex(df.index.month).values
+    std = grouped.std().reindex(df.index.month).values
+
+    return (df - mean) / std
+
+
+def sam_index(source, base=None, cachedir=None):
+    """
+    Monthly SAM index of a reanalysis, cached by source,
+    base period, the content of its files and the code that
+    computes it, so it's computed again only when one of
+    them changes.
+
+    Parameters
+    ----------
+    source : str
+        Key of SOURCES
+    base : tuple
+        (first, last) years of the normalisation, e.g.
+        (1971, 2000), default is the whole record
+
+    Returns
+    -------
+    pd.DataFrame with a monthly PeriodIndex, as the station
+    series of skill.monthly_axis, and the columns 'p40' and
+    'p65' (zonal mean pressure in the units of the source)
+    and 'sam'
+    """
+    meta = SOURCES[source]
+
+    path = cache.cache_path('sam', cache.cache_key(
+        source, meta, LATITUDES, base,
+        [function_key(func) for func in [check_global, latitude_rows, monthly_zonal_means, normalise]],
+        [file_digest(f, cachedir=cachedir) for f in meta['files']]), cachedir=cachedir)
+
+    result = cache.load(path)
+
+    if result is None:
+        ds = open_reanalysis(meta['files'])
+
+        pressure = monthly_zonal_means(ds, meta['var'], meta['lat'], meta['lon'])
+
+        normalised = normalise(pressure, base)
+
+        result = pd.DataFrame({
+            'p40': pressure.iloc[:, 0],
+            'p65': pressure.iloc[:, 1],
+            'sam': normalised.iloc[:, 0] - normalised.iloc[:, 1],
+        })
+
+        cache.store(path, result)
+
+    return result
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Austral seasons (DJF, MAM, JJA and SON) of
+#            monthly station tables and reanalysis datasets,
+#            with DJF spanning two calendar years
+
+import numpy as np
+import pandas as pd
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+SEASONS = np.array(['DJF', 'MAM', 'JJA', 'SON'])
+
+# Middle month of each season, used as its time stamp
+MIDDLE = np.array([1, 4, 7, 10])
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+# December belongs to the DJF of the next year, so DJF 1990
+# is Dec/1989, Jan/1990 and Feb/1990
+
+def season_year(time):
+    """
+    Returns (season year, season number) arrays of a time
+    index, where season 0 is DJF, 1 MAM, 2 JJA and 3 SON
+    """
+    time = pd.DatetimeIndex(time)
+
+    month = np.asarray(time.month)
+    year = np.asarray(time.year)
+
+    return year + (month == 12), (month % 12) // 3
+
+
+def seasonal(df, how='mean', min_months=3):
+    """
+    Season means or sums of monthly series.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Monthly DatetimeIndex or PeriodIndex, one column per
+        series
+    how : str
+        'mean' or 'sum'
+    min_months : int
+        Valid months needed for a season value, else NaN. The
+        default needs the 3 months, so incomplete DJF at the
+        ends of a series are NaN
+
+    Returns
+    -------
+    pd.DataFrame with (year, season) index, so unstack()
+    gives a year x season table
+    """
+    if how not in ['mean', 'sum']:
+        raise ValueError("how must be 'mean' or 'sum', not {}".format(how))
+
+    index = df.index.to_timestamp() if isinstance(df.index, pd.PeriodIndex) else df.index
+
+    year, season = season_year(index)
+
+    # Grouping by the season number keeps them in
+    # chronological order, DJF first in each year
+    grouped = df.groupby([year, season])
+
+    result = grouped.agg(how).where(grouped.count() >= min_months)
+
+    result.index = pd.MultiIndex.from_arrays([
+        result.index.get_level_values(0),
+        SEASONS[result.index.get_level_values(1)]],
+        names=['year', 'season'])
+
+    return result
+
+
+def seasonal_dataset(ds, how='mean', min_months=3, time='time'):
+    """
+    Season means or sums of a monthly xarray Dataset or
+    DataArray in one groupby reduction.
+
+    Returns
+    -------
+    Same type of ds with one time step per season, stamped
+    at the first day of its middle month, and 'year' and
+    'season' coordinates along time
+    """
+    if how not in ['mean', 'sum']:
+        raise ValueError("how must be 'mean' or 'sum', not {}".format(how))
+
+    year, season = season_year(ds[time].values)
+
+    # One integer per season, in chronological order
+    key = year * 4 + season
+
+    ds = ds.assign_coords(season_key=(time, key))
+
+    grouped = ds.groupby('season_key')
+
+    result = getattr(grouped, how)(dim=time)
+    result = result.where(ds.notnull().groupby('season_key').sum(dim=time) >= min_months)
+
+    key = result['season_key'].values
+
+    stamp = pd.to_datetime(pd.DataFrame({
+        'year': key // 4,
+        'month': MIDDLE[key % 4],
+        'day': 1}))
+
+    result = result.rename({'season_key': time})
+
+    return result.assign_coords({
+        time: stamp.values,
+        'year': (time, key // 4),
+        'season': (time, SEASONS[key % 4]),
+    })
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Significance of linear trends of short and
+#            autocorrelated series by resampling (block
+#            bootstrap, permutation and AR(1) surrogates),
+#            for all series at once and in parallel
+
+import warnings
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# Resamples generated together in one array by a worker
+CHUNK = 250
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+# All series are resampled in the same (resample, series,
+# time) arrays. The permutations use them compacted to their
+# valid values, left aligned and padded with NaN. The lag-1
+# autocorrelation, AR(1) surrogates and bootstrap blocks use
+# them on the full time axis, so values on both sides of a
+# gap aren't taken as neighbours
+
+def time_axis(index):
+    """
+    Returns the index as decimal years, so trends are given
+    per year whatever the series frequency
+    """
+    if isinstance(index, pd.PeriodIndex):
+        index = index.to_timestamp()
+
+    if isinstance(index, pd.DatetimeIndex):
+        return np.asarray(index.year + (index.dayofyear - 1) / 365.25, dtype=float)
+
+    return np.asarray(index, dtype=float)
+
+
+def compact(df):
+    """
+    Returns (x, y, length) arrays with the valid values of
+    each column moved to the start of its row
+
+    Returns
+    -------
+    x, y : np.ndarray
+        (series, time) arrays padded with NaN
+    length : np.ndarray
+        Number of valid values of each series
+    """
+    y = df.to_numpy(dtype=float).T
+    x = np.broadcast_to(time_axis(df.index), y.shape)
+
+    valid = ~np.isnan(y)
+
+    # Stable sort puts the valid positions first, in order
+    order = np.argsort(~valid, axis=1, kind='stable')
+
+    length = valid.sum(axis=1)
+    pad = np.arange(y.shape[1]) >= length[:, None]
+
+    x = np.where(pad, np.nan, np.take_along_axis(x, order, axis=1))
+    y = np.where(pad, np.nan, np.take_along_axis(y, order, axis=1))
+
+    return x, y, length
+
+
+def slopes(x, y):
+    """
+    Least squares slope and intercept along the last axis of
+    arrays with NaN where missing
+    """
+    valid = ~(np.isnan(x) | np.isnan(y))
+    n = valid.sum(axis=-1)
+
+    x = np.where(valid, x, 0.)
+    y = np.where(valid, y, 0.)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        xm = x.sum(axis=-1) / n
+        ym = y.sum(axis=-1) / n
+
+        xa = np.where(valid, x - xm[..., None], 0.)
+        ya = np.where(valid, y - ym[..., None], 0.)
+
+        slope = (xa * ya).sum(axis=-1) / (xa * xa).sum(axis=-1)
+
+    return slope, ym - slope * xm
+
+
+def ols_pvalue(x, y):
+    """
+    Two-sided p-value of the slope from the t distribution,
+    the one of scipy.stats.linregress, for comparison
+    """
+    from scipy import stats
+
+    slope, intercept = slopes(x, y)
+
+    valid = ~(np.isnan(x) | np.isnan(y))
+    n = valid.sum(axis=-1)
+
+    residual = np.where(valid, y - (intercept[..., None] + slope[..., None] * x), 0.)
+    xa = np.where(valid, x - np.nanmean(np.where(valid, x, np.nan), axis=-1)[..., None], 0.)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stderr = np.sqrt((residual ** 2).sum(axis=-1) / (n - 2) / (xa ** 2).sum(axis=-1))
+
+        return 2 * stats.t.sf(np.abs(slope / stderr), n - 2)
+
+
+def consecutive(x):
+    """
+    True where the time step after each one of a (series,
+    time) axis is the next one, i.e. no time step is missing
+    between them. The step is the shortest one of the axis
+    """
+    step = np.diff(x, axis=-1)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        shortest = np.nanmin(np.where(step > 0, step, np.nan))
+
+    # Months and years of different lengths are still
+    # consecutive
+    return step < 1.5 * shortest
+
+
+def lag1(residual, x):
+    """
+    Lag-1 autocorrelation of each residual series on the full
+    time axis x, from the pairs of consecutive valid values
+    only
+    """
+    pairs = residual[:, 1:] * residual[:, :-1]
+    pairs = np.where(consecutive(x), pairs, np.nan)
+
+    r0 = np.nansum(residual * residual, axis=1)
+    r1 = np.nansum(pairs, axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        phi = r1 / r0
+
+    return np.clip(np.nan_to_num(phi), -0.99, 0.99)
+
+
+def _block_bootstrap(rng, size, x, fit, residual, first, last, block):
+    """
+    Slopes of fit + residuals resampled in moving blocks of
+    consecutive time steps between the first and last valid
+    values of each series, on the full time axis. Missing
+    values inside a block stay missing
+    """
+    nseries, ntime = residual.shape
+
+    nblock = -(-ntime // block)
+
+    # Block starts between first and last - block + 1
+    span = last - first + 1
+    choices = np.maximum(span - block, 0) + 1
+    starts = first[:, None] + (rng.random((size, nseries, nblock)) * choices[:, None]).astype(int)
+
+    blocks = (starts[..., None] + np.arange(block)).reshape(size, nseries, -1)[..., :ntime]
+    blocks = np.minimum(blocks, last[:, None])
+
+    # Blocks laid from the first valid time step, nothing
+    # before it or after the last one
+    offset = np.clip(np.arange(ntime) - first[:, None], 0, ntime - 1)
+    index = np.take_along_axis(blocks, np.broadcast_to(offset, blocks.shape), axis=2)
+
+    resampled = np.take_along_axis(
+        np.broadcast_to(residual, (size,) + residual.shape), index, axis=2)
+
+    outside = (np.arange(ntime) < first[:, None]) | (np.arange(ntime) > last[:, None])
+
+    return slopes(x, np.where(outside, np.nan, fit + resampled))[0]
+
+
+def _permutation(rng, size, x, y):
+    """
+    Slopes of the valid values of each series shuffled in time
+    """
+    keys = rng.random((size,) + y.shape)
+    keys[:, np.isnan(y)] = np.inf
+
+    order = np.argsort(keys, axis=2)
+
+    return slopes(x, np.take_along_axis(np.broadcast_to(y, keys.shape), order, axis=2))[0]
+
+
+def _ar1(rng, size, x, phi, sigma):
+    """
+    Slopes of AR(1) surrogates with the lag-1 autocorrelation
+    and variance of each series residual, but no trend. They
+    are built on the full time axis x and then masked where
+    the series is missing
+    """
+    noise = rng.standard_normal((size,) + x.shape) * (sigma * np.sqrt(1 - phi ** 2))[:, None]
+
+    surrogate = np.empty_like(noise)
+    surrogate[..., 0] = noise[..., 0] / np.sqrt(1 - phi ** 2)
+
+    for t in range(1, x.shape[1]):
+        surrogate[..., t] = phi * surrogate[..., t - 1] + noise[..., t]
+
+    return slopes(x, np.where(np.isnan(x), np.nan, surrogate))[0]
+
+
+def _resample(job):
+    """
+    Runs one chunk of resamples of the three tests in a
+    worker, with its own child seed
+    """
+    seed, size, x, y, full, fit, residual, first, last, block, phi, sigma = job
+
+    rng = np.random.default_rng(seed)
+
+    return (
+        _block_bootstrap(rng, size, full, fit, residual, first, last, block),
+        _permutation(rng, size, x, y),
+        _ar1(rng, size, full, phi, sigma))
+
+
+def trend_significance(df, n_resamples=5000, block=None, alpha=0.05, seed=None, processes=None):
+    """
+    Linear trend of every column of df, with a block
+    bootstrap confidence interval and permutation and AR(1)
+    surrogate p-values, in one call.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        One series per column on a regular time index, e.g.
+        the annual means of all stations, NaN where missing.
+        Values on both sides of a gap aren't neighbours in
+        the lag-1 autocorrelation, AR(1) surrogates and
+        bootstrap blocks
+    n_resamples : int
+        Resamples of each test
+    block : int
+        Block length of the bootstrap, default is the cube
+        root of the longest series
+    alpha : float
+        The confidence interval is 1 - alpha
+    seed : int
+        Seed of the SeedSequence that spawns one child seed
+        per chunk, so results don't depend on the number of
+        processes
+    processes : int
+        Number of workers, default is the number of cores
+
+    Returns
+    -------
+    pd.DataFrame with one row per column of df: n, slope
+    (per year), intercept, lag1, ols_pvalue, ci_low, ci_high,
+    p_permutation and p_ar1
+    """
+    x, y, length = compact(df)
+
+    slope, intercept = slopes(x, y)
+
+    # Time, fit and residuals on the full time axis, with
+    # time NaN where the series is missing
+    values = df.to_numpy(dtype=float).T
+    axis = np.broadcast_to(time_axis(df.index), values.shape)
+
+    valid = ~np.isnan(values)
+    full = np.where(valid, axis, np.nan)
+
+    fit = intercept[:, None] + slope[:, None] * axis
+    residual = values - fit
+
+    first = np.where(length > 0, valid.argmax(axis=1), 0)
+    last = np.where(length > 0, valid.shape[1] - 1 - valid[:, ::-1].argmax(axis=1), 0)
+
+    phi = lag1(residual, axis)
+    sigma = np.sqrt(np.nansum(residual ** 2, axis=1) / np.maximum(length - 2, 1))
+
+    if block is None:
+        block = max(1, int(round(length.max() ** (1. / 3))))
+
+    sizes = [CHUNK] * (n_resamples // CHUNK)
+    if n_resamples % CHUNK:
+        sizes.append(n_resamples % CHUNK)
+
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    jobs = [(s, size, x, y, full, fit, residual, first, last, block, phi, sigma) for s, size in zip(seeds, sizes)]
+
+    # Scripts don't have a __main__ guard, so workers are
+    # forked where possible, as in render.py
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        chunks = list(pool.map(_resample, jobs))
+
+    bootstrap, permutation, ar1 = [np.concatenate(parts) for parts in zip(*chunks)]
+
+    # Series too short to have a slope get NaN everywhere
+    undefined = np.isnan(slope)
+
+    p_permutation = (1 + (np.abs(permutation) >= np.abs(slope)).sum(axis=0)) / (n_resamples + 1.)
+    p_ar1 = (1 + (np.abs(ar1) >= np.abs(slope)).sum(axis=0)) / (n_resamples + 1.)
+
+    p_permutation[undefined] = np.nan
+    p_ar1[undefined] = np.nan
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        ci_low, ci_high = np.nanpercentile(bootstrap, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+
+    return pd.DataFrame({
+        'n': length,
+        'slope': slope,
+        'intercept': intercept,
+        'lag1': phi,
+        'ols_pvalue': ols_pvalue(x, y),
+        'ci_low': ci_low,
+        'ci_high': ci_high,
+        'p_permutation': p_permutation,
+        'p_ar1': p_ar1,
+    }, index=df.columns)
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Skill of reanalysis series against station
+#            monthly series (bias, RMSE, correlation, vector
+#            correlation and Taylor diagram statistics) for
+#            all pairs and calendar months at once
+
+import numpy as np
+import pandas as pd
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# Columns of the table returned by skill(). Month 0 stands
+# for all months together
+COLUMNS = [
+    'source', 'station', 'variable', 'month', 'n',
+    'obs_mean', 'mod_mean', 'bias', 'rmse', 'crmse',
+    'obs_std', 'mod_std', 'std_ratio', 'corr', 'veering']
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def monthly_axis(df):
+    """
+    Returns df with a monthly PeriodIndex, so series with
+    month start, month end or mid-month time stamps align
+    """
+    df = df.copy()
+
+    if not isinstance(df.index, pd.PeriodIndex):
+        df.index = pd.DatetimeIndex(df.index).to_period('M')
+
+    return df.groupby(level=0).mean()
+
+
+def month_groups(index):
+    """
+    (13, time) boolean array, the first row selects all
+    months and row m the calendar month m
+    """
+    months = np.asarray(index.month)
+
+    return np.vstack([np.ones(months.shape, dtype=bool)] +
+                     [months == m for m in range(1, 13)])
+
+
+def align(observed, modelled):
+    """
+    Aligns station and reanalysis series on a common
+    monthly axis.
+
+    Parameters
+    ----------
+    observed : pd.DataFrame
+        Time on index and (station, variable) on columns, e.g.
+        store.query(sources=['reader'], variables=['wspd', 'u', 'v'], wide=True)
+    modelled : dict
+        Source name and a DataFrame like observed with the
+        reanalysis series at each station (point or box)
+
+    Returns
+    -------
+    index : pd.PeriodIndex
+    pairs : pd.MultiIndex
+        (source, station, variable) of each pair
+    obs, mod : np.ndarray
+        (pair, time) arrays, NaN where one of them is missing
+    """
+    observed = monthly_axis(observed)
+    modelled = dict((source, monthly_axis(df)) for source, df in modelled.items())
+
+    start = min([observed.index.min()] + [df.index.min() for df in modelled.values()])
+    end = max([observed.index.max()] + [df.index.max() for df in modelled.values()])
+
+    index = pd.period_range(start, end, freq='M')
+
+    observed = observed.reindex(index)
+
+    keys, obs, mod = [], [], []
+
+    for source, df in modelled.items():
+        common = observed.columns.intersection(df.columns)
+
+        keys.extend((source,) + tuple(column) for column in common)
+        obs.append(observed[common].to_numpy(dtype=float).T)
+        mod.append(df.reindex(index)[common].to_numpy(dtype=float).T)
+
+    obs = np.concatenate(obs) if obs else np.empty((0, len(index)))
+    mod = np.concatenate(mod) if mod else np.empty((0, len(index)))
+
+    # Only months with both values are compared
+    both = ~(np.isnan(obs) | np.isnan(mod))
+    obs = np.where(both, obs, np.nan)
+    mod = np.where(both, mod, np.nan)
+
+    pairs = pd.MultiIndex.from_tuples(keys, names=['source', 'station', 'variable'])
+
+    return index, pairs, obs, mod
+
+
+def _moments(obs, mod, groups):
+    """
+    Sums over time of each (pair, group) with einsum, where
+    obs and mod are (pair, time) arrays, real or complex,
+    with NaN where missing
+    """
+    valid = ~np.isnan(obs)
+    weights = (valid[:, None, :] & groups[None, :, :]).astype(float)
+
+    obs = np.where(valid, obs, 0)
+    mod = np.where(valid, mod, 0)
+
+    n = weights.sum(axis=2)
+    count = np.where(n > 0, n, np.nan)
+
+    def mean(x):
+        return np.einsum('pgt,pt->pg', weights, x) / count
+
+    obs_mean = mean(obs)
+    mod_mean = mean(mod)
+
+    # Anomalies of each group mean, (pair, group, time)
+    obs_anom = (obs[:, None, :] - obs_mean[..., None]) * weights
+    mod_anom = (mod[:, None, :] - mod_mean[..., None]) * weights
+
+    obs_var = (np.abs(obs_anom) ** 2).sum(axis=2) / count
+    mod_var = (np.abs(mod_anom) ** 2).sum(axis=2) / count
+    cov = (np.conj(obs_anom) * mod_anom).sum(axis=2) / count
+
+    mse = np.einsum('pgt,pt->pg', weights, np.abs(mod - obs) ** 2) / count
+
+    return n, obs_mean, mod_mean, obs_var, mod_var, cov, mse
+
+
+def _table(pairs, n, obs_mean, mod_mean, obs_var, mod_var, cov, mse):
+    obs_std = np.sqrt(obs_var)
+    mod_std = np.sqrt(mod_var)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = cov / (obs_std * mod_std)
+
+        # Centered RMSE, the distance to the observation on a
+        # Taylor diagram: E'^2 = so^2 + sm^2 - 2 so sm R
+        crmse = np.sqrt(np.maximum(obs_var + mod_var - 2 * np.real(cov), 0))
+
+        table = {
+            'n': n.astype(int),
+            'obs_mean': np.abs(obs_mean) if np.iscomplexobj(obs_mean) else obs_mean,
+            'mod_mean': np.abs(mod_mean) if np.iscomplexobj(mod_mean) else mod_mean,
+            'bias': np.abs(mod_mean - obs_mean) if np.iscomplexobj(obs_mean) else mod_mean - obs_mean,
+            'rmse': np.sqrt(mse),
+            'crmse': crmse,
+            'obs_std': obs_std,
+            'mod_std': mod_std,
+            'std_ratio': mod_std / obs_std,
+            'corr': np.abs(corr) if np.iscomplexobj(corr) else corr,
+            'veering': np.degrees(np.angle(corr)) if np.iscomplexobj(corr) else np.full(n.shape, np.nan),
+        }
+
+    npair, ngroup = n.shape
+
+    df = pd.DataFrame(dict((key, value.ravel()) for key, value in table.items()))
+
+    df.insert(0, 'month', np.tile(np.arange(ngroup), npair))
+
+    for i, name in enumerate(reversed(pairs.names)):
+        df.insert(0, name, np.repeat(pairs.get_level_values(name).values, ngroup))
+
+    return df
+
+
+def skill(observed, modelled, vector=('u', 'v')):
+    """
+    Skill metrics of every station x source pair and every
+    calendar month in one vectorized operation.
+
+    Scalar variables are compared one by one. When both
+    sides have the vector components, they are also compared
+    as complex numbers w = u + iv, in a row with variable
+    'uv', where corr is the magnitude and veering the angle
+    (degrees, counterclockwise from the observed to the
+    modelled vector) of the complex correlation of Kundu
+    (1976), rmse is the vector RMSE and bias the magnitude
+    of the mean vector difference
+
+    Parameters
+    ----------
+    observed : pd.DataFrame
+        Time on index and (station, variable) on columns
+    modelled : dict
+        Source name and a DataFrame like observed, e.g.
+        {'era5': era5_df, '20crv3': twentieth_df}
+    vector : tuple
+        Names of the zonal and meridional components, None
+        skips the vector comparison
+
+    Returns
+    -------
+    pd.DataFrame with COLUMNS, month 0 is all months
+    together. Taylor diagram points are (std_ratio, corr)
+    with crmse as the distance to the observation
+    """
+    index, pairs, obs, mod = align(observed, modelled)
+
+    groups = month_groups(index)
+
+    tables = [_table(pairs, *_moments(obs, mod, groups))]
+
+    if vector is not None:
+        variables = pairs.get_level_values('variable')
+
+        u = pairs[variables == vector[0]].droplevel('variable')
+        v = pairs[variables == vector[1]].droplevel('variable')
+
+        common = u.intersection(v, sort=False)
+
+        if len(common):
+            iu = pairs.droplevel('variable')[variables == vector[0]].get_indexer(common)
+            iv = pairs.droplevel('variable')[variables == vector[1]].get_indexer(common)
+
+            rows_u = np.flatnonzero(variables == vector[0])[iu]
+            rows_v = np.flatnonzero(variables == vector[1])[iv]
+
+            vector_pairs = pd.MultiIndex.from_tuples(
+                [key + (''.join(vector),) for key in common],
+                names=pairs.names)
+
+            tables.append(_table(vector_pairs, *_moments(
+                obs[rows_u] + 1j * obs[rows_v],
+                mod[rows_u] + 1j * mod[rows_v],
+                groups)))
+
+    return pd.concat(tables, ignore_index=True)[COLUMNS]
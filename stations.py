@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Meteorological stations' metadata shared by the
+#            processing and map scripts, with coordinates
+#            parsed once and a spatial index for nearest
+#            station, radius and reanalysis cell queries
+
+import numpy as np
+import pandas as pd
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+METADICT = {
+'arturo_prat'    : { 'file': 'arturo_prat',    'name': 'Arturo Prat',    'id': '89057', 'lat': '62.5S', 'lon': '59.7W', 'alt': 5   },
+'bellingshausen' : { 'file': 'bellingshausen', 'name': 'Bellingshausen', 'id': '89050', 'lat': '62.2S', 'lon': '58.9W', 'alt': 16  },
+'deception'      : { 'file': 'deception',      'name': 'Deception',      'id': '88938', 'lat': '63.0S', 'lon': '60.7W', 'alt': 8   },
+'esperanza'      : { 'file': 'esperanza',      'name': 'Esperanza',      'id': '88963', 'lat': '63.4S', 'lon': '57.0W', 'alt': 13  },
+'faraday'        : { 'file': 'faraday',        'name': 'Faraday',        'id': '89063', 'lat': '65.4S', 'lon': '64.4W', 'alt': 11  },
+'ferraz'         : { 'file': 'ferraz',         'name': 'Ferraz',         'id': '89252', 'lat': '62.1S', 'lon': '58.4W', 'alt': 20  },
+'great_wall'     : { 'file': 'great_wall',     'name': 'Great Wall',     'id': '89058', 'lat': '62.2S', 'lon': '59.0W', 'alt': 10  },
+'jubany'         : { 'file': 'jubany',         'name': 'Jubany',         'id': '89053', 'lat': '62.2S', 'lon': '58.6W', 'alt': 4   },
+'king_sejong'    : { 'file': 'king_sejong',    'name': 'King Sejong',    'id': '89251', 'lat': '62.2S', 'lon': '58.7W', 'alt': 11  },
+'marambio'       : { 'file': 'marambio',       'name': 'Marambio',       'id': '89055', 'lat': '64.2S', 'lon': '56.7W', 'alt': 198 },
+'marsh'          : { 'file': 'marsh',          'name': 'Marsh',          'id': '89056', 'lat': '62.2S', 'lon': '58.9W', 'alt': 10  },
+'o_higgins'      : { 'file': 'o_higgins',      'name': "O'Higgins",      'id': '89059', 'lat': '63.3S', 'lon': '57.9W', 'alt': 10  },
+'orcadas'        : { 'file': 'orcadas',        'name': 'Orcadas',        'id': '88968', 'lat': '60.7S', 'lon': '44.7W', 'alt': 6   },
+'palmer'         : { 'file': 'palmer',         'name': 'Palmer',         'id': '89061', 'lat': '64.3S', 'lon': '64.0W', 'alt': 8   },
+'signy'          : { 'file': 'signy',          'name': 'Signy',          'id': '89042', 'lat': '60.7S', 'lon': '45.6W', 'alt': 6   },
+}
+
+# Other sites of the map scripts, with their plotted
+# positions in degrees. Stations also in METADICT are here
+# to keep their more precise positions. kind tells stations
+# from sites that aren't one (the lake and the NCEP/NCAR
+# grid point), which are left out of the station queries
+SITES = {
+'lago'           : { 'lon': -58.88, 'lat': -62.183, 'name': 'Profound Lake',           'kind': 'site'    },
+'reanalise'      : { 'lon': -62.5 , 'lat': -62.5  , 'name': u'Reanálise 1\nNCEP/NCAR', 'kind': 'site'    },
+'bellingshausen' : { 'lon': -59.  , 'lat': -62.2  , 'name': 'Bellingshausen',          'kind': 'station' },
+'deception'      : { 'lon': -60.7 , 'lat': -63.   , 'name': 'Deception',               'kind': 'station' },
+'faraday'        : { 'lon': -64.3 , 'lat': -65.2  , 'name': 'Faraday',                 'kind': 'station' },
+'palmer'         : { 'lon': -64.05, 'lat': -64.767, 'name': 'Palmer',                  'kind': 'station' },
+'vernadsky'      : { 'lon': -64.25, 'lat': -65.25 , 'name': 'Vernadsky',               'kind': 'station' },
+'halley'         : { 'lon': -26.6 , 'lat': -75.58 , 'name': 'Halley',                  'kind': 'station' },
+'marion'         : { 'lon': 37.9  , 'lat': -46.9  , 'name': 'Marion Island',           'kind': 'station' },
+'amsterdam'      : { 'lon': 77.5  , 'lat': -37.8  , 'name': 'Ile Nouvelle\nAmsterdam', 'kind': 'station' },
+'hobart'         : { 'lon': 147.3 , 'lat': -42.9  , 'name': 'Hobart',                  'kind': 'station' },
+'christchurch'   : { 'lon': 172.6 , 'lat': -43.5  , 'name': 'Christchurch',            'kind': 'station' },
+'puerto_montt'   : { 'lon': -73.1 , 'lat': -39.6  , 'name': 'Puerto\nMontt',           'kind': 'station' },
+'valdivia'       : { 'lon': -73.1 , 'lat': -39.6  , 'name': 'Valdivia',                'kind': 'station' },
+'gough'          : { 'lon': -9.9  , 'lat': -40.4  , 'name': 'Gough Island',            'kind': 'station' },
+'novolazara'     : { 'lon': 11.8  , 'lat': -70.8  , 'name': 'Novolazarevskaya',        'kind': 'station' },
+'mawson'         : { 'lon': 62.9  , 'lat': -67.6  , 'name': 'Mawson',                  'kind': 'station' },
+'mirny'          : { 'lon': 93.0  , 'lat': -66.6  , 'name': 'Mirny',                   'kind': 'station' },
+'casey'          : { 'lon': 110.5 , 'lat': -66.3  , 'name': 'Casey',                   'kind': 'station' },
+'dumont'         : { 'lon': 140.0 , 'lat': -66.7  , 'name': u'Dumont D’urville',       'kind': 'station' },
+}
+
+# Mean Earth radius (km) of the distances
+EARTH_RADIUS = 6371.
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def parse_coordinate(value):
+    """
+    Converts a coordinate like '62.5S' or '59.7W' into signed
+    degrees (-62.5, -59.7). Numbers are returned as floats
+    """
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+
+    value = value.strip().upper()
+
+    if value[-1] in 'NSEW':
+        return (-1. if value[-1] in 'SW' else 1.) * float(value[:-1])
+
+    return float(value)
+
+
+def registry():
+    """
+    One table of all stations and map sites.
+
+    Returns
+    -------
+    pd.DataFrame with the keys on index and name, lat, lon
+    (floats, degrees north and east), kind ('station' or
+    'site'), id, alt and file columns, the last three NaN
+    for sites that are only in the maps
+    """
+    rows = {}
+
+    for key, meta in METADICT.items():
+        rows[key] = dict(meta, lat=parse_coordinate(meta['lat']), lon=parse_coordinate(meta['lon']), kind='station')
+
+    for key, meta in SITES.items():
+        rows[key] = dict(rows.get(key, {}), **meta)
+
+    table = pd.DataFrame.from_dict(rows, orient='index')
+    table.index.name = 'station'
+
+    return table.reindex(columns=['name', 'lat', 'lon', 'kind', 'id', 'alt', 'file']).sort_index()
+
+
+def site_dict(keys, **names):
+    """
+    {key: {'lon', 'lat', 'name'}} of some registry() entries,
+    the layout the map scripts use, with names replaced by
+    the keywords given, e.g. site_dict(['lago'], lago='Glubokoe Deepe')
+    """
+    table = registry().loc[list(keys)]
+
+    return dict(
+        (key, {'lon': row['lon'], 'lat': row['lat'], 'name': names.get(key, row['name'])})
+        for key, row in table.iterrows())
+
+
+def unit_vectors(lat, lon):
+    """
+    (..., 3) cartesian unit vectors of positions in degrees,
+    where chord distances grow with great circle distances
+    """
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+
+    return np.stack([np.cos(lat) * np.cos(lon),
+                     np.cos(lat) * np.sin(lon),
+                     np.sin(lat)], axis=-1)
+
+
+def chord_to_km(chord):
+    """
+    Great circle distance (km) of a chord of the unit sphere
+    """
+    return 2. * EARTH_RADIUS * np.arcsin(np.clip(np.asarray(chord) / 2., 0., 1.))
+
+
+def km_to_chord(km):
+    """
+    Chord of the unit sphere of a great circle distance (km)
+    """
+    return 2. * np.sin(np.minimum(np.asarray(km, dtype=float) / EARTH_RADIUS, np.pi) / 2.)
+
+
+def _select(stations=None, kind='station'):
+    """
+    registry() rows of stations, else the ones of kind, else
+    all of them
+    """
+    table = registry()
+
+    if stations is not None:
+        return table.loc[list(stations)]
+
+    if kind is not None:
+        return table[table['kind'] == kind]
+
+    return table
+
+
+def spatial_index(stations=None, kind='station'):
+    """
+    KD-tree of registry() positions on the unit sphere.
+
+    Parameters
+    ----------
+    stations : sequence
+        Keys indexed, default is all of kind
+    kind : str
+        'station', 'site' or None for all registry() entries,
+        used when stations isn't given
+
+    Returns
+    -------
+    table : pd.DataFrame
+        registry() rows indexed, in tree order
+    tree : scipy.spatial.cKDTree
+
+    Requirements
+    ------------
+    NEED SCIPY MODULE INSTALLED
+    """
+    from scipy.spatial import cKDTree
+
+    table = _select(stations, kind)
+
+    return table, cKDTree(unit_vectors(table['lat'].values, table['lon'].values))
+
+
+def nearest_stations(lat, lon, k=1, stations=None, kind='station'):
+    """
+    k nearest stations of many positions in one query.
+
+    Parameters
+    ----------
+    lat, lon : array_like
+        Query positions (degrees), broadcasting together
+    k : int
+    stations, kind :
+        Entries searched, see spatial_index
+
+    Returns
+    -------
+    pd.DataFrame with one row per position and neighbour:
+    point (position number), rank (0 is the nearest),
+    station and distance (km)
+    """
+    table, tree = spatial_index(stations, kind)
+
+    k = min(k, len(table))
+
+    points = unit_vectors(*np.broadcast_arrays(lat, lon)).reshape(-1, 3)
+
+    chord, i = tree.query(points, k=k)
+
+    chord = np.asarray(chord).reshape(len(points), k)
+    i = np.asarray(i).reshape(len(points), k)
+
+    return pd.DataFrame({
+        'point': np.repeat(np.arange(len(points)), k),
+        'rank': np.tile(np.arange(k), len(points)),
+        'station': table.index.values[i.ravel()],
+        'distance': chord_to_km(chord.ravel()),
+    })
+
+
+def stations_within(lat, lon, radius, stations=None, kind='station'):
+    """
+    Stations within radius (km) of many positions in one
+    query. stations and kind are the entries searched, see
+    spatial_index.
+
+    Returns
+    -------
+    pd.DataFrame with point (position number), station and
+    distance (km), nearest first within each point
+    """
+    table, tree = spatial_index(stations, kind)
+
+    points = unit_vectors(*np.broadcast_arrays(lat, lon)).reshape(-1, 3)
+
+    found = tree.query_ball_point(points, km_to_chord(radius))
+
+    point = np.repeat(np.arange(len(points)), [len(i) for i in found])
+    i = np.concatenate([np.asarray(i, dtype=int) for i in found]) if len(found) else np.array([], dtype=int)
+
+    chord = np.linalg.norm(points[point] - unit_vectors(table['lat'].values[i], table['lon'].values[i]), axis=-1)
+
+    result = pd.DataFrame({
+        'point': point,
+        'station': table.index.values[i],
+        'distance': chord_to_km(chord),
+    })
+
+    return result.sort_values(['point', 'distance']).reset_index(drop=True)
+
+
+def _nearest_axis(coord, values, period=None):
+    """
+    Index of the nearest coord to each value, along a
+    monotonic axis that may wrap around period
+    """
+    coord = np.asarray(coord, dtype=float)
+    values = np.asarray(values, dtype=float)
+
+    distance = values[:, None] - coord[None, :]
+
+    if period is not None:
+        distance = (distance + period / 2.) % period - period / 2.
+
+    return np.abs(distance).argmin(axis=1)
+
+
+def station_cells(lat, lon, stations=None, kind='station'):
+    """
+    Reanalysis grid cell of each station.
+
+    Parameters
+    ----------
+    lat, lon : array_like
+        Grid coordinates, 1D for regular grids (any order,
+        longitudes from -180 to 180 or 0 to 360) or 2D for
+        curvilinear ones
+    stations, kind :
+        Entries, default is all stations, see spatial_index
+
+    Returns
+    -------
+    pd.DataFrame indexed by station with the cell indexes
+    (i along lat, j along lon), the cell lat and lon and
+    its distance (km) to the station, so a whole grid is
+    sampled at all stations with
+    ds.isel(lat=xr.DataArray(cells['i']), lon=xr.DataArray(cells['j']))
+    """
+    table = _select(stations, kind)
+
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+
+    if lat.ndim == 1:
+        i = _nearest_axis(lat, table['lat'].values)
+        j = _nearest_axis(lon, table['lon'].values, period=360.)
+
+        cell_lat, cell_lon = lat[i], lon[j]
+
+    else:
+        from scipy.spatial import cKDTree
+
+        tree = cKDTree(unit_vectors(lat.ravel(), lon.ravel()))
+
+        flat = tree.query(unit_vectors(table['lat'].values, table['lon'].values))[1]
+
+        i, j = np.unravel_index(flat, lat.shape)
+
+        cell_lat, cell_lon = lat[i, j], lon[i, j]
+
+    chord = np.linalg.norm(
+        unit_vectors(cell_lat, cell_lon) -
+        unit_vectors(table['lat'].values, table['lon'].values), axis=-1)
+
+    return pd.DataFrame({
+        'i': i,
+        'j': j,
+        'lat': cell_lat,
+        'lon': cell_lon,
+        'distance': chord_to_km(chord),
+    }, index=table.index, columns=['i', 'j', 'lat', 'lon', 'distance'])
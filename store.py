@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: One columnar store (Parquet) for all stations'
+#            time series, indexed by source, station,
+#            variable and time, and the adapters that load
+#            each source
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from dtypes import VALUE_DTYPE, compact
+from flags import FLAG_DTYPE, NOFLAG, parse_flagged
+from reader import monthly_index
+from stations import METADICT
+from wind import pol2cart_wind
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+STOREDIR = os.environ.get(
+    'ANNABIA_STOREDIR',
+    os.path.expanduser('~/Desktop/bia/arquivos/store'))
+
+# Columns of the store, all sources are converted to them
+COLUMNS = ['source', 'station', 'variable', 'time', 'month', 'value', 'flag']
+
+# Files are split by source, variable and then station, so
+# queries only open the folders they need and a station
+# loaded from two sources (e.g. READER and its workbook)
+# keeps both
+PARTITIONS = ['source', 'variable', 'station']
+
+SEASONS = {
+    'DJF': [12, 1, 2],
+    'MAM': [3, 4, 5],
+    'JJA': [6, 7, 8],
+    'SON': [9, 10, 11],
+}
+
+##################################################################################################################################
+#### ADAPTERS ####################################################################################################################
+##################################################################################################################################
+# Each adapter returns a DataFrame with COLUMNS
+
+def tidy(values, time, station, variable, flags=None, source=None):
+    """
+    Builds a store DataFrame of one station and variable of
+    a source
+    """
+    time = pd.DatetimeIndex(time)
+    values = np.asarray(values, dtype=float).ravel()
+
+    if flags is None:
+        flags = np.full(values.shape, NOFLAG, dtype=FLAG_DTYPE)
+
+    return pd.DataFrame({
+        'source': source,
+        'station': station,
+        'variable': variable,
+        'time': time,
+        'month': time.month.astype(np.int8),
+        'value': values,
+        'flag': np.asarray(flags, dtype=FLAG_DTYPE).ravel(),
+    })
+
+
+def with_components(df):
+    """
+    Appends u and v rows computed from the wspd and wdir rows
+    of the same source, station and time
+    """
+    wide = df.pivot_table(
+        index=['source', 'station', 'time'],
+        columns='variable',
+        values='value',
+        dropna=False)
+
+    if not {'wspd', 'wdir'} <= set(wide.columns):
+        return df
+
+    u, v = pol2cart_wind(wide['wspd'], wide['wdir'])
+
+    parts = [df]
+
+    for name, values in [('u', u), ('v', v)]:
+        for (source, station), series in values.groupby(level=['source', 'station']):
+            parts.append(tidy(
+                series.values,
+                series.index.get_level_values('time'),
+                station,
+                name,
+                source=source))
+
+    return pd.concat(parts, ignore_index=True)
+
+
+def from_reader(archive, source='reader'):
+    """
+    Store rows of a station x variable x time DataArray
+    from reader.load_reader_archive
+    """
+    data = archive.transpose('station', 'variable', 'time').values
+
+    parts = [
+        tidy(data[i, j],
+             archive.time.values,
+             str(station),
+             str(variable),
+             source=source)
+        for i, station in enumerate(archive['station'].values)
+        for j, variable in enumerate(archive['variable'].values)]
+
+    return with_components(pd.concat(parts, ignore_index=True))
+
+
+def from_station_xlsx(key, rootdir, source='workbook'):
+    """
+    Store rows of a station workbook used by estacoes.py, with
+    wind speed on Sheet1 and direction on Sheet2 as year x month
+    tables of 'value(flag)' cells
+    """
+    path = os.path.join(rootdir, METADICT[key]['file'] + '.xlsx')
+
+    parts = []
+
+    for sheet, variable in [('Sheet1', 'wspd'), ('Sheet2', 'wdir')]:
+        table = pd.read_excel(path, sheet_name=sheet, na_values=['-'], index_col='Year')
+
+        values, flags = parse_flagged(table)
+
+        parts.append(tidy(values.values, monthly_index(table.index), key, variable, flags, source=source))
+
+    return with_components(pd.concat(parts, ignore_index=True))
+
+
+def from_inumet(path, station='artigas', source='inumet'):
+    """
+    Store rows of the INUMET workbook used by
+    vento_temp_artigas.py (sub-daily temp, wspd and wdir)
+    """
+    df = pd.read_excel(
+        path,
+        header=None,
+        names=['datetime', 'temp', 'wspd', 'wdir'],
+        skiprows=1,
+        index_col='datetime',
+        na_values=['', 'variable'])
+
+    parts = [tidy(df[var].values, df.index, station, var, source=source) for var in ['temp', 'wspd', 'wdir']]
+
+    return with_components(pd.concat(parts, ignore_index=True))
+
+
+def from_year_month_tables(paths, station, source='inumet'):
+    """
+    Store rows of year x month workbooks, one per variable,
+    like the direction and speed ones of Bellingshausen used
+    by vento_bellingshausen.py
+
+    Parameters
+    ----------
+    paths : dict
+        Variable names and workbook paths, e.g.
+        {'wdir': '.../vento_bellingshausen_direcao.xlsx',
+         'wspd': '.../vento_bellingshausen_velocidade.xlsx'}
+    station : str
+    """
+    parts = []
+
+    for variable, path in paths.items():
+        table = pd.read_excel(path, header=0, index_col=0, na_values=['', '-'])
+
+        parts.append(tidy(table.values, monthly_index(table.index), station, variable, source=source))
+
+    return with_components(pd.concat(parts, ignore_index=True))
+
+##################################################################################################################################
+#### STORE #######################################################################################################################
+##################################################################################################################################
+
+def write(df, storedir=None):
+    """
+    Writes store rows into the Parquet dataset. Existing data
+    of the same source, variable and station is replaced, so
+    loading a source again doesn't duplicate it, while the
+    other sources of the station are kept
+
+    Requirements
+    ------------
+    NEED PYARROW MODULE INSTALLED
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if storedir is None:
+        storedir = STOREDIR
+
+    # Same column types in every file, whatever the dtypes
+    # of the frame given
+    df = df[COLUMNS].astype({
+        'month': np.int8,
+        'value': VALUE_DTYPE,
+        'flag': FLAG_DTYPE,
+    }).sort_values(['source', 'variable', 'station', 'time'])
+
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        storedir,
+        format='parquet',
+        partitioning=PARTITIONS,
+        partitioning_flavor='hive',
+        existing_data_behavior='delete_matching')
+
+
+def query(stations=None, variables=None, start=None, end=None, months=None,
+          columns=('station', 'variable', 'time', 'value'), wide=False, storedir=None,
+          sources=None):
+    """
+    Reads only the partitions, row groups and columns needed
+    to answer a query, e.g. all READER stations, u and v,
+    from 1980 to 2010 in DJF:
+
+        query(sources=['reader'], variables=['u', 'v'], start='1980',
+              end='2010-12-31', months='DJF', wide=True)
+
+    Parameters
+    ----------
+    stations, variables, sources : list
+        Default is all of them. sources are the ones of the
+        adapters, e.g. 'reader', 'workbook' and 'inumet'
+    start, end : str or datetime
+        Time limits, both included
+    months : str or list
+        Season name ('DJF', 'MAM', 'JJA' or 'SON') or months
+    columns : tuple
+        Columns returned
+    wide : bool
+        Returns time on index and (station, variable) on
+        columns instead of the tidy rows. The stations and
+        variables must then come from one source, see sources
+
+    Requirements
+    ------------
+    NEED PYARROW MODULE INSTALLED
+    """
+    import pyarrow.dataset as ds
+
+    if storedir is None:
+        storedir = STOREDIR
+
+    dataset = ds.dataset(storedir, format='parquet', partitioning='hive')
+
+    conditions = []
+
+    if sources is not None:
+        conditions.append(ds.field('source').isin(list(sources)))
+    if stations is not None:
+        conditions.append(ds.field('station').isin(list(stations)))
+    if variables is not None:
+        conditions.append(ds.field('variable').isin(list(variables)))
+    if start is not None:
+        conditions.append(ds.field('time') >= pd.Timestamp(start).to_datetime64())
+    if end is not None:
+        conditions.append(ds.field('time') <= pd.Timestamp(end).to_datetime64())
+    if months is not None:
+        if isinstance(months, str):
+            if months not in SEASONS:
+                raise ValueError('months must be one of {} or a list of months, not {}'.format(sorted(SEASONS), months))
+
+            months = SEASONS[months]
+
+        conditions.append(ds.field('month').isin([int(month) for month in months]))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    if wide:
+        columns = ('source', 'station', 'variable', 'time', 'value')
+
+    df = dataset.to_table(columns=list(columns), filter=expression).to_pandas()
+
+    # float32 values, uint8 flags and categorical identifiers
+    df = compact(df)
+
+    if wide:
+        counts = df.groupby(['station', 'variable'], observed=True)['source'].nunique()
+
+        if (counts > 1).any():
+            raise ValueError(
+                'Stations with more than one source, choose them with sources: {}'.format(
+                    sorted(set(counts[counts > 1].index.get_level_values('station')))))
+
+        return df.pivot_table(
+            index='time',
+            columns=['station', 'variable'],
+            values='value',
+            observed=True,
+            dropna=False)
+
+    return df.sort_values(list(c for c in ['source', 'station', 'variable', 'time'] if c in df)).reset_index(drop=True)
@@ -19,6 +19,11 @@ import pandas as pd
 
 from datetime import datetime
 
+from aggregation import aggregate, year_month_table
+from gaps import gap_report
+from output import write_table
+from profiling import stage
+
 sys.path.insert(0, os.path.expanduser('~/Dropbox/airsea'))
 
 import airsea
@@ -31,6 +36,11 @@ DATADIR = u'/home/douglasnehme/Desktop/bia/arquivos'
 
 filename = u'Datos INUMET Antártida 1998-2016_vento e temp.xlsx'
 new_filename = u'Datos INUMET Antártida 1998-2016_vento e temp_groupedby.xlsx'
+coverage_filename = u'Datos INUMET Antártida 1998-2016_vento e temp_coverage.xlsx'
+
+# Months with less than this fraction of the expected 6-hourly
+# observations are left empty
+MIN_COVERAGE = 0.75
 ##############################################################################
 # OPENNING AND MANIPULATING DATA #############################################
 ##############################################################################
@@ -42,17 +52,18 @@ columns_name =[
 ]
 
 # Open file
-df = pd.read_excel(
-    os.path.join(
-        DATADIR,
-        filename
-    ),
-    header=None,
-    names=columns_name,
-    skiprows=1,
-    index_col='datetime',
-    na_values=['', 'variable']
-)
+with stage('read_excel'):
+    df = pd.read_excel(
+        os.path.join(
+            DATADIR,
+            filename
+        ),
+        header=None,
+        names=columns_name,
+        skiprows=1,
+        index_col='datetime',
+        na_values=['', 'variable']
+    )
 
 # # Drop wind direction variable
 # df.drop(
@@ -62,25 +73,35 @@ df = pd.read_excel(
 # )
 
 # Fill gaps with NaN
-df = df.resample('6H').asfreq()
+with stage('resample'):
+    df = df.resample('6h').asfreq()
 
-df['u'], df['v'] = airsea.pol2cart_wind(
-    df.wspd,
-    df.wdir,
-    rnd=1
-)
+# Completeness of each variable, used to choose the
+# analysis period
+print(gap_report(df))
+
+with stage('wind_components'):
+    df['u'], df['v'] = airsea.pol2cart_wind(
+        df.wspd,
+        df.wdir,
+        rnd=1
+    )
 ##########################################################
 # Transforming index from a daily series from 01/1998 to 
 # 05/2016 over all rows length to a yearly series over all
 # rows length and monthly variations on columns dimension
 ##########################################################
-df = df.groupby([df.index.year, df.index.month]).mean()
-df.index.names = ['', ''] 
-df = df.unstack()
+with stage('year_month_table'):
+    monthly = aggregate(df, freq='MS', step='6h', min_coverage=MIN_COVERAGE)
+
+    df = year_month_table(monthly)
+    coverage = year_month_table(monthly, layer='coverage')
 ##########################################################
 
 # Save
-df.to_excel(os.path.join(DATADIR, new_filename))
+with stage('write'):
+    write_table(df, os.path.join(DATADIR, new_filename))
+    write_table(coverage, os.path.join(DATADIR, coverage_filename))
 
 stop = datetime.now().replace(microsecond=0)
 
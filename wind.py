@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Vectorized wind conversions between speed and
+#            direction and zonal and meridional components,
+#            and lazy diagnostics of gridded wind fields
+
+import numpy as np
+
+##################################################################################################################################
+#### CONFIG PARAMETERS AND GLOBAL VARIABLES ######################################################################################
+##################################################################################################################################
+# pep-8 conventions suggest upper case for global variables
+
+# Air density (kg/m^3) and neutral drag coefficient of the
+# bulk wind stress proxy, tau = RHO_AIR * DRAG * |U| * U
+RHO_AIR = 1.22
+DRAG = 1.3e-3
+
+# Time steps per chunk of the gridded diagnostics, one
+# year of hourly ERA5 fields
+CHUNK = 8760
+
+##################################################################################################################################
+#### FUNCTIONS ###################################################################################################################
+##################################################################################################################################
+
+def pol2cart_wind(wspd, wdir, axes_rotation=0, magnetic_declination=0):
+    """
+    Converts wind speed and direction (in degrees, meteorological
+    convention) into zonal and meridional components.
+
+    Array version of pol2cart_wind in estacoes.py, without the
+    rounding steps. All arguments may be arrays, or pandas and
+    xarray objects, that broadcast together, so a rotation or a
+    declination per station, month or time step is applied in
+    the same operation.
+
+    Parameters
+    ----------
+    wspd : array_like
+        wind speed
+    wdir : array_like
+        wind direction (in degrees)
+    axes_rotation : array_like
+        permits axes rotation with positive values doing a
+        clockwise movement and negative values an anticlockwise
+    magnetic_declination : array_like
+        permits correction between true and magnetic norths
+
+    Returns
+    -------
+    u, v
+    """
+    # From meteorological (wdir) to cartesian referential (phi)
+    phi = np.radians(90. - (wdir + magnetic_declination) + axes_rotation)
+
+    u = wspd * np.cos(phi)
+    v = wspd * np.sin(phi)
+
+    return u, v
+
+
+def cart2pol_wind(u, v, axes_rotation=0, magnetic_declination=0):
+    """
+    Converts zonal and meridional wind components into speed
+    and direction (in degrees, meteorological convention,
+    between 0 and 360).
+
+    Array version of cart2pol_wind in estacoes.py, without the
+    rounding steps, see pol2cart_wind for the arguments.
+
+    Returns
+    -------
+    wspd, wdir
+    """
+    wspd = np.hypot(u, v)
+    phi = np.degrees(np.arctan2(v, u))
+
+    # From cartesian (phi) to meteorological referential (wdir)
+    wdir = (90. - (phi + magnetic_declination) + axes_rotation) % 360.
+
+    return wspd, wdir
+
+
+def rotate_components(u, v, axes_rotation):
+    """
+    Components of the wind on axes rotated by axes_rotation
+    degrees (positive clockwise, as in pol2cart_wind),
+    without going through speed and direction
+    """
+    theta = np.radians(axes_rotation)
+
+    return (u * np.cos(theta) - v * np.sin(theta),
+            u * np.sin(theta) + v * np.cos(theta))
+
+
+def wind_diagnostics(ds, u='u10', v='v10', axes_rotation=0, magnetic_declination=0):
+    """
+    Adds wind speed, meteorological direction, rotated
+    components and the bulk wind stress proxy to a Dataset
+    with zonal and meridional wind fields.
+
+    Only array expressions are used, so with a Dataset opened
+    with chunks (dask) nothing is computed until the result
+    is reduced, saved or loaded, and then every chunk is
+    computed in parallel on all cores.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+    u, v : str
+        Names of the wind component variables
+    axes_rotation : float or xr.DataArray
+        Rotation of the axes of u_rot and v_rot, e.g. one
+        angle per grid point
+    magnetic_declination : float or xr.DataArray
+        Correction of the direction between true and
+        magnetic norths
+
+    Returns
+    -------
+    xr.Dataset with the new variables wspd, wdir, u_rot,
+    v_rot, taux and tauy, with long_name and units
+    """
+    U = ds[u]
+    V = ds[v]
+
+    wspd, wdir = cart2pol_wind(U, V, magnetic_declination=magnetic_declination)
+    u_rot, v_rot = rotate_components(U, V, axes_rotation)
+
+    stress = RHO_AIR * DRAG * wspd
+
+    diagnostics = {
+        'wspd': (wspd, 'Wind speed', 'm s**-1'),
+        'wdir': (wdir, 'Wind direction', 'degrees'),
+        'u_rot': (u_rot, 'Wind component along rotated x axis', 'm s**-1'),
+        'v_rot': (v_rot, 'Wind component along rotated y axis', 'm s**-1'),
+        'taux': (stress * U, 'Zonal wind stress proxy', 'N m**-2'),
+        'tauy': (stress * V, 'Meridional wind stress proxy', 'N m**-2'),
+    }
+
+    return ds.assign(dict(
+        (name, data.assign_attrs(long_name=long_name, units=units))
+        for name, (data, long_name, units) in diagnostics.items()))
+
+
+def wind_climatology(path, by='month', u='u10', v='v10', chunks=None, workers=None, **kwargs):
+    """
+    Climatology of the wind diagnostics over a whole
+    reanalysis file in one call, e.g. monthly means of speed,
+    direction-free components and stress of the full ERA5
+    domain:
+
+        clim = wind_climatology('era5_wind.nc')
+
+    Parameters
+    ----------
+    path : str or list
+        netCDF file(s) with u and v fields
+    by : str
+        Time grouping, 'month' or 'season'
+    chunks : dict
+        Dask chunks, default is CHUNK time steps
+    workers : int
+        Threads computing the chunks, default is all cores
+    kwargs :
+        Passed to wind_diagnostics
+
+    Returns
+    -------
+    xr.Dataset computed in memory, with the mean of each
+    variable per group. The mean direction is recomputed
+    from the mean components, since mean angles aren't
+
+    Requirements
+    ------------
+    NEED DASK MODULE INSTALLED
+    """
+    from reanalysis import open_reanalysis
+
+    if chunks is None:
+        chunks = {'time': CHUNK}
+
+    ds = open_reanalysis(path, chunks=chunks)
+
+    diagnostics = wind_diagnostics(ds, u=u, v=v, **kwargs)
+
+    clim = diagnostics.groupby('time.' + by).mean('time', keep_attrs=True)
+
+    clim['wdir'] = cart2pol_wind(
+        clim[u], clim[v],
+        magnetic_declination=kwargs.get('magnetic_declination', 0))[1].assign_attrs(clim['wdir'].attrs)
+
+    return clim.compute(num_workers=workers)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# AUTOR: Douglas Medeiros Nehme
+#
+# CONTACT: medeiros.douglas3@gmail.com
+#
+# CRIATION: oct/2026
+#
+# LAST MODIFICATION: oct/2026
+#
+# OBJECTIVE: Exporting monthly wind data to the hourly
+#            table read by WRPlot without building the
+#            hourly DataFrame in memory
+
+import csv
+
+import numpy as np
+
+from datetime import timedelta
+
+################################################
+#### Config Parameters and Global Variables ####
+################################################
+
+HEADER = ['', 'wspd', 'wdir', 'year', 'month', 'day', 'hour']
+
+HOUR = timedelta(hours=1)
+
+################################################
+#### Functions #################################
+################################################
+
+def wrplot_rows(df, columns=('wspd', 'wdir')):
+    """
+    Yields, one by one, the rows of the hourly table
+    expected by WRPlot from a DataFrame with monthly
+    DatetimeIndex.
+
+    Only the first hour of each month has values, every
+    other hour from the first to the last month is
+    yielded with None on the data columns, which means
+    an empty cell for WRPlot.
+
+    Each row is (datetime, *columns, year, month, day, hour)
+    """
+    values = df[list(columns)].to_numpy(dtype=float)
+    times = df.index.to_pydatetime()
+
+    empty = (None,) * len(columns)
+
+    for i in range(len(times)):
+        row = tuple(
+            None if np.isnan(value) else float(value)
+            for value in values[i])
+
+        t = times[i]
+        stop = times[i + 1] if i + 1 < len(times) else t + HOUR
+
+        while t < stop:
+            yield (t,) + row + (t.year, t.month, t.day, t.hour)
+
+            row = empty
+            t = t + HOUR
+
+
+def write_wrplot(df, path, columns=('wspd', 'wdir')):
+    """
+    Writes the WRPlot hourly table of a monthly DataFrame
+    streaming rows from wrplot_rows.
+
+    Files ending with '.csv' are written with the csv
+    module, other ones as xlsx with xlsxwriter in
+    constant memory mode, where each row is flushed to
+    disk as soon as the next one starts.
+
+    Requirements
+    ------------
+    NEED XLSXWRITER MODULE INSTALLED FOR XLSX FILES
+    """
+    header = HEADER[:1] + list(columns) + HEADER[3:]
+    rows = wrplot_rows(df, columns=columns)
+
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+
+            for row in rows:
+                writer.writerow(
+                    ['' if cell is None else cell for cell in row])
+
+        return
+
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+    worksheet = workbook.add_worksheet()
+
+    date_format = workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'})
+
+    worksheet.write_row(0, 0, header)
+
+    for r, row in enumerate(rows, start=1):
+        worksheet.write_datetime(r, 0, row[0], date_format)
+
+        for c, cell in enumerate(row[1:], start=1):
+            # Leaving cells unwritten keeps them empty to
+            # follow WRPlot needs
+            if cell is not None:
+                worksheet.write_number(r, c, cell)
+
+    workbook.close()